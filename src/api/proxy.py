@@ -0,0 +1,280 @@
+"""
+Proxy Middleware for Load Balancer
+
+This module forwards client requests to the backend servers at the WSGI level,
+so proxied requests skip Flask's URL routing, request context and response
+objects. API and management requests are passed on to the Flask application.
+"""
+
+import json
+import logging
+import time
+from http.client import responses as HTTP_REASONS
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import quote
+import urllib3
+from werkzeug.wsgi import LimitedStream
+
+from ..core.load_balancer import LoadBalancer, Server
+
+
+logger = logging.getLogger(__name__)
+
+STREAM_CHUNK_SIZE = 65536  # Bytes read from the backend per response chunk
+
+PROXY_TIMEOUT = 30  # Seconds to wait for the backend to connect and respond
+
+# Path prefixes handled by the Flask application instead of being proxied
+APP_PATH_PREFIXES = ('/api/', '/manage/')
+
+# Characters left unquoted in the forwarded path, besides letters, digits and
+# '_.-~': the path separator and the sub-delimiters allowed in a path segment
+PATH_SAFE_CHARS = "/:@!$&'()*+,;="
+
+# Methods that are forwarded to the backend servers
+PROXY_METHODS = frozenset({'GET', 'HEAD', 'POST', 'PUT', 'DELETE', 'PATCH'})
+
+# Connection-level headers that must not be forwarded by a proxy (RFC 7230)
+HOP_BY_HOP_HEADERS = frozenset({
+    'connection',
+    'keep-alive',
+    'proxy-authenticate',
+    'proxy-authorization',
+    'te',
+    'trailer',
+    'transfer-encoding',
+    'upgrade',
+})
+
+# Client request headers that are not forwarded to the backend. Content-Length
+# is set from the body that is actually sent.
+EXCLUDED_REQUEST_HEADERS = HOP_BY_HOP_HEADERS | {'host', 'content-length'}
+
+
+def _request_headers(environ: Dict) -> Dict[str, str]:
+    """
+    Rebuild the client's request headers from a WSGI environ.
+    
+    Args:
+        environ: The WSGI environ of the request.
+    
+    Returns:
+        The headers to forward to the backend.
+    """
+    headers = {}
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            name = key[5:].replace('_', '-').title()
+        elif key == 'CONTENT_TYPE' and value:
+            name = 'Content-Type'
+        else:
+            continue
+        if name.lower() not in EXCLUDED_REQUEST_HEADERS:
+            headers[name] = value
+    return headers
+
+
+class BackendBody:
+    """
+    WSGI response iterable over a streamed backend response body.
+    
+    The request is recorded and the backend connection released once the body
+    has been sent, or in close() when the WSGI server gives up on it earlier.
+    close() also covers a client that goes away before the first chunk, where
+    a generator's cleanup would never run. A backend failure mid-body is
+    recorded as an error and re-raised so the server drops the truncated
+    response.
+    """
+    
+    def __init__(self, server: Server, response: urllib3.HTTPResponse, start_time: float):
+        """
+        Initialize the body.
+        
+        Args:
+            server: The server that handled the request.
+            response: The streamed backend response.
+            start_time: When the request was forwarded.
+        """
+        self.server = server
+        self.response = response
+        self.start_time = start_time
+        self._completed = False
+        self._failed = False
+        self._closed = False
+    
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield chunks of the raw response body."""
+        try:
+            yield from self.response.stream(STREAM_CHUNK_SIZE, decode_content=False)
+            self._completed = True
+        except (urllib3.exceptions.HTTPError, OSError) as e:
+            self._failed = True
+            self.server.record_error()
+            logger.error("Error streaming response from %s: %s", self.server.name, e)
+            raise
+        finally:
+            # Finish as soon as the body is done, without waiting for close()
+            self.close()
+    
+    def close(self) -> None:
+        """Record the request and release the backend connection."""
+        if self._closed:
+            return
+        self._closed = True
+        
+        if not self._failed:
+            # Covers the transfer, so the response time includes the body
+            self.server.record_request(time.time() - self.start_time)
+        # Only a fully read connection can be reused for the next request
+        if not self._completed:
+            self.response.close()
+        self.response.release_conn()
+
+
+class ProxyMiddleware:
+    """
+    WSGI middleware that proxies requests to the backend servers.
+    
+    Requests for API and management paths, and methods that are not proxied,
+    are handed to the wrapped application.
+    """
+    
+    def __init__(self, wsgi_app: Callable, load_balancer: LoadBalancer, http_pool: urllib3.PoolManager):
+        """
+        Initialize the middleware.
+        
+        Args:
+            wsgi_app: The WSGI application serving the API routes.
+            load_balancer: The LoadBalancer instance.
+            http_pool: The connection pool used to reach the backend servers.
+        """
+        self.wsgi_app = wsgi_app
+        self.load_balancer = load_balancer
+        self.http_pool = http_pool
+    
+    def __call__(self, environ: Dict, start_response: Callable) -> Iterable[bytes]:
+        path_info = environ.get('PATH_INFO') or '/'
+        if path_info.startswith(APP_PATH_PREFIXES) or environ['REQUEST_METHOD'] not in PROXY_METHODS:
+            return self.wsgi_app(environ, start_response)
+        
+        try:
+            return self._proxy(environ, start_response, path_info)
+        except Exception as e:
+            logger.error("Error handling proxy request: %s", e)
+            return self._error(start_response, '500 Internal Server Error', {"error": "Internal server error"})
+    
+    def _proxy(self, environ: Dict, start_response: Callable, path_info: str) -> Iterable[bytes]:
+        """
+        Forward a request to the backend server chosen for it.
+        
+        Args:
+            environ: The WSGI environ of the request.
+            start_response: The WSGI start_response callable.
+            path_info: The request path, as the latin-1 string WSGI provides.
+        
+        Returns:
+            The response body iterable.
+        """
+        # PATH_INFO is percent-decoded and carries the path bytes as latin-1.
+        # It is quoted again for the backend so that '?' or '#' sent as %3F or
+        # %23 stay part of the path; URL paths are ASCII by RFC, so only other
+        # paths need decoding to match Flask's path
+        raw_path = path_info.encode('latin-1')
+        target_path = quote(raw_path[1:], safe=PATH_SAFE_CHARS)
+        if path_info.isascii():
+            path = path_info[1:]
+        else:
+            path = raw_path.decode('utf-8', 'replace')[1:]
+        
+        # Determine the key for consistent hashing
+        # Use client IP + path as the key
+        client_ip = environ.get('HTTP_X_FORWARDED_FOR', environ.get('REMOTE_ADDR'))
+        key = f"{client_ip}:{path}"
+        
+        # Get the server for this key
+        server = self.load_balancer.get_server_cached(key)
+        if not server:
+            return self._error(start_response, '503 Service Unavailable', {"error": "No healthy servers available"})
+        
+        # Build the target URL
+        target_url = server.base_url + target_path
+        query_string = environ.get('QUERY_STRING')
+        if query_string:
+            target_url += "?" + query_string
+        
+        # Stream bodies of known length from the WSGI input instead of copying
+        # them; dechunked bodies are read so they get a Content-Length
+        headers = _request_headers(environ)
+        body = None
+        content_length = environ.get('CONTENT_LENGTH')
+        if content_length and content_length != '0':
+            headers['Content-Length'] = content_length
+            body = LimitedStream(environ['wsgi.input'], int(content_length))
+        elif environ.get('wsgi.input_terminated'):
+            body = environ['wsgi.input'].read()
+        
+        # Record request start time
+        start_time = time.time()
+        
+        try:
+            # Forward the request, streaming the response body back
+            response = self.http_pool.urlopen(
+                environ['REQUEST_METHOD'],
+                target_url,
+                body=body,
+                headers=headers,
+                redirect=False,
+                retries=False,
+                timeout=PROXY_TIMEOUT,
+                preload_content=False,
+                decode_content=False
+            )
+        except urllib3.exceptions.HTTPError as e:
+            # Record failed request
+            server.record_error()
+            
+            logger.error("Error forwarding request to %s: %s", server.name, e)
+            return self._error(start_response, '502 Bad Gateway', {
+                "error": "Backend server error",
+                "server": server.name,
+                "message": str(e)
+            })
+        
+        # Time to the backend's response headers
+        response_time = time.time() - start_time
+        
+        # Pass the body through undecoded so Content-Encoding and
+        # Content-Length stay valid
+        response_headers: List[Tuple[str, str]] = [
+            # iteritems keeps repeated headers like Set-Cookie apart; items()
+            # joins them on urllib3 1.26
+            (name, value) for name, value in response.headers.iteritems()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        # Add load balancer headers
+        response_headers.append(('X-Load-Balancer-Server', server.name))
+        response_headers.append(('X-Load-Balancer-Response-Time', '%.3f' % response_time))
+        
+        status = response.status
+        start_response('%d %s' % (status, response.reason or HTTP_REASONS.get(status, '')), response_headers)
+        return BackendBody(server, response, start_time)
+    
+    @staticmethod
+    def _error(start_response: Callable, status: str, payload: Dict) -> List[bytes]:
+        """
+        Send a JSON error response.
+        
+        Args:
+            start_response: The WSGI start_response callable.
+            status: The HTTP status line, e.g. "502 Bad Gateway".
+            payload: The JSON body.
+        
+        Returns:
+            The response body iterable.
+        """
+        body = json.dumps(payload).encode('utf-8')
+        start_response(status, [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(body)))
+        ])
+        return [body]
@@ -5,10 +5,19 @@ This module defines the API routes and request handlers for the load balancer.
 It provides a more organized way to handle different API endpoints.
 """
 
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, request, Response
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import BaseConverter
+import json
 import logging
+import re
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple
+try:
+    import orjson  # Fast C JSON serializer
+except ImportError:
+    # Make orjson optional since it requires installation
+    orjson = None
 
 from ..core.load_balancer import LoadBalancer, Server
 from ..utils.health_check import HealthChecker
@@ -16,6 +25,302 @@ from ..utils.health_check import HealthChecker
 
 logger = logging.getLogger(__name__)
 
+# How long (in seconds) a cached read-only response may be served
+RESPONSE_CACHE_TTL = 0.25
+
+# Query string values accepted as "true" for boolean flags
+TRUTHY_VALUES = {'1', 'true', 'yes'}
+
+# Characters and length allowed in server names
+SERVER_NAME_PATTERN = r'[A-Za-z0-9_.:-]{1,64}'
+SERVER_NAME_RE = re.compile(SERVER_NAME_PATTERN)
+
+
+class ServerNameConverter(BaseConverter):
+    """URL converter that only matches valid server names."""
+    
+    regex = SERVER_NAME_PATTERN
+
+
+def _register_converters(state) -> None:
+    """Register the URL converters used by the routes on the application."""
+    state.app.url_map.converters.setdefault('server_name', ServerNameConverter)
+
+
+def _dumps(obj: Any) -> bytes:
+    """
+    Encode an object as compact JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        obj: The object to encode.
+        
+    Returns:
+        The JSON-encoded object.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _flag(args, name: str) -> bool:
+    """
+    Check whether a boolean query string flag is set.
+    
+    Args:
+        args: The request arguments.
+        name: The name of the flag.
+        
+    Returns:
+        True if the flag is set to a truthy value (case-insensitive).
+    """
+    return args.get(name, '').lower() in TRUTHY_VALUES
+
+
+def _loads(raw: bytes) -> Any:
+    """
+    Decode JSON bytes.
+    
+    Uses orjson when it is installed and falls back to the standard library.
+    
+    Args:
+        raw: The JSON-encoded bytes.
+        
+    Returns:
+        The decoded object.
+        
+    Raises:
+        ValueError: If the bytes are not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _read_json() -> Any:
+    """
+    Parse the JSON body of the current request.
+    
+    Reads the raw body without caching it on the request, so only the parsed
+    object is kept in memory.
+    
+    Returns:
+        The decoded body, or None if the body is empty, not JSON or malformed.
+    """
+    if not request.is_json:
+        return None
+    
+    raw = request.get_data(cache=False)
+    if not raw:
+        return None
+    
+    try:
+        return _loads(raw)
+    except ValueError:
+        return None
+
+
+def _server_info(server: Server) -> Dict[str, Any]:
+    """
+    Build the API representation of a server.
+    
+    Args:
+        server: The server to describe.
+        
+    Returns:
+        A dictionary with the server's static fields and current metrics.
+    """
+    info = server.get_static_info()
+    info.update(
+        healthy=server.healthy,
+        last_health_check=server.last_health_check,
+        request_count=server.request_count,
+        error_count=server.error_count,
+        average_response_time=server.get_average_response_time(),
+        error_rate=server.error_count / server.request_count if server.request_count else 0
+    )
+    return info
+
+
+def _parse_server(data: Dict[str, Any]) -> Tuple[Optional[Server], Optional[str]]:
+    """
+    Validate a server definition from a request body and create the server.
+    
+    Args:
+        data: The server definition.
+        
+    Returns:
+        A (server, error) tuple where exactly one of the two is None.
+    """
+    if not isinstance(data, dict):
+        return None, "Server definition must be a JSON object"
+    
+    # Validate required fields
+    required_fields = ["name", "address", "port"]
+    for field in required_fields:
+        if field not in data:
+            return None, f"Missing required field: {field}"
+    
+    if not isinstance(data["name"], str) or not SERVER_NAME_RE.fullmatch(data["name"]):
+        return None, "Name must be 1-64 letters, digits or '_', '.', ':', '-' characters"
+    
+    # Validate data types
+    try:
+        port = int(data["port"])
+        weight = int(data.get("weight", 1))
+    except (TypeError, ValueError):
+        return None, "Port and weight must be integers"
+    
+    if port <= 0 or port > 65535:
+        return None, "Port must be between 1 and 65535"
+    
+    if weight <= 0:
+        return None, "Weight must be positive"
+    
+    server = Server(
+        name=data["name"],
+        address=data["address"],
+        port=port,
+        weight=weight
+    )
+    return server, None
+
+
+def _watch_server(health_checker: HealthChecker, server: Server, data: Dict[str, Any]) -> None:
+    """
+    Register a server with the health checker using the check options from a request body.
+    
+    Args:
+        health_checker: The HealthChecker instance.
+        server: The server to monitor.
+        data: The server definition, which may contain health check options.
+    """
+    health_checker.add_server(
+        server_id=server.name,
+        server_info={
+            "address": server.address,
+            "port": server.port
+        },
+        check_type=data.get("health_check_type", "tcp"),
+        check_endpoint=data.get("health_check_endpoint", "/health"),
+        expected_status=data.get("expected_status", 200)
+    )
+
+
+def _handle_unexpected_error(error: Exception):
+    """
+    Turn an unhandled exception raised by a route into a JSON 500 response.
+    
+    HTTP errors raised by Flask/Werkzeug (e.g. 405 Method Not Allowed) are
+    passed through unchanged.
+    
+    Args:
+        error: The exception raised by the route.
+        
+    Returns:
+        A Flask Response object or the HTTP exception itself.
+    """
+    if isinstance(error, HTTPException):
+        return error
+    
+    logger.exception("Error handling %s %s", request.method, request.path)
+    return _json({"error": "Internal server error"}, 500)
+
+
+def _json(obj: Any, status: int = 200) -> Response:
+    """
+    Create a JSON response without going through flask.jsonify.
+    
+    Args:
+        obj: The object to encode.
+        status: The HTTP status code.
+        
+    Returns:
+        A Flask Response object.
+    """
+    return Response(_dumps(obj), status=status, mimetype='application/json')
+
+
+class ResponseCache:
+    """
+    A small in-process cache of pre-encoded JSON responses.
+    
+    Entries are keyed by the load balancer and health checker versions plus a
+    TTL time bucket, so any pool or health change invalidates them immediately
+    while volatile counters are refreshed at least every TTL.
+    """
+    
+    def __init__(self, load_balancer: LoadBalancer, health_checker: HealthChecker, ttl: float = RESPONSE_CACHE_TTL):
+        """
+        Initialize a new ResponseCache instance.
+        
+        Args:
+            load_balancer: The LoadBalancer instance.
+            health_checker: The HealthChecker instance.
+            ttl: The maximum age (in seconds) of a cached response.
+        """
+        self.load_balancer = load_balancer
+        self.health_checker = health_checker
+        self.ttl = ttl
+        self._entries = {}  # name -> (cache_key, body, status)
+    
+    def get(self, name: str, build: Callable[[], Tuple[Dict[str, Any], int]]) -> Response:
+        """
+        Get a cached response, rebuilding it if it is stale.
+        
+        Args:
+            name: The name of the cached endpoint.
+            build: A function returning the response payload and status code.
+            
+        Returns:
+            A Flask Response object with the JSON-encoded payload.
+        """
+        cache_key = self._cache_key()
+        entry = self._entries.get(name)
+        if entry is None or entry[0] != cache_key:
+            payload, status = build()
+            entry = (cache_key, _dumps(payload), status)
+            self._entries[name] = entry
+        
+        return Response(entry[1], status=entry[2], mimetype='application/json')
+    
+    def get_stream(self, name: str, generate: Callable[[], Iterator[bytes]]) -> Response:
+        """
+        Get a cached response, streaming a fresh one if it is stale.
+        
+        On a miss the body is sent chunk by chunk as it is generated and is
+        only stored in the cache once the whole body has been produced.
+        
+        Args:
+            name: The name of the cached endpoint.
+            generate: A function returning an iterator of JSON-encoded chunks.
+            
+        Returns:
+            A Flask Response object with the JSON-encoded payload.
+        """
+        cache_key = self._cache_key()
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == cache_key:
+            return Response(entry[1], status=entry[2], mimetype='application/json')
+        
+        def stream() -> Iterator[bytes]:
+            chunks = []
+            for chunk in generate():
+                chunks.append(chunk)
+                yield chunk
+            self._entries[name] = (cache_key, b''.join(chunks), 200)
+        
+        return Response(stream(), mimetype='application/json')
+    
+    def _cache_key(self) -> Tuple[int, int, float]:
+        """Get the cache key for the current state and time bucket."""
+        return (
+            self.load_balancer.version,
+            self.health_checker.version,
+            time.monotonic() // self.ttl if self.ttl > 0 else time.monotonic()
+        )
+
 
 def create_api_routes(load_balancer: LoadBalancer, health_checker: HealthChecker) -> Blueprint:
     """
@@ -29,371 +334,304 @@ def create_api_routes(load_balancer: LoadBalancer, health_checker: HealthChecker
         A Flask Blueprint with all API routes.
     """
     api_bp = Blueprint('api', __name__, url_prefix='/api')
+    api_bp.register_error_handler(Exception, _handle_unexpected_error)
+    api_bp.record_once(_register_converters)
     
-    @api_bp.route('/servers', methods=['GET'])
-    def get_servers():
-        """Get all servers and their status."""
-        try:
-            servers = []
-            for server in load_balancer.get_all_servers():
-                server_info = {
-                    "name": server.name,
-                    "address": server.address,
-                    "port": server.port,
-                    "weight": server.weight,
-                    "healthy": server.healthy,
-                    "last_health_check": server.last_health_check,
-                    "request_count": server.request_count,
-                    "error_count": server.error_count,
-                    "average_response_time": server.get_average_response_time(),
-                    "url": server.get_url(),
-                    "error_rate": (
-                        server.error_count / server.request_count 
-                        if server.request_count > 0 else 0
-                    )
-                }
+    response_cache = ResponseCache(load_balancer, health_checker)
+    
+    def generate_servers_payload(brief: bool = False) -> Iterator[bytes]:
+        """
+        Generate the JSON payload for the server listing in chunks.
+        
+        Args:
+            brief: Whether to only include the static fields and health flag
+                   of each server, skipping metrics and health check details.
+        """
+        servers = load_balancer.get_all_servers()
+        get_summary = health_checker.get_summary
+        healthy_count = 0
+        
+        yield b'{"servers":['
+        for index, server in enumerate(servers):
+            healthy_count += server.healthy
+            
+            if brief:
+                server_info = server.get_static_info()
+                server_info["healthy"] = server.healthy
+            else:
+                server_info = _server_info(server)
                 
                 # Add health check details if available
-                health_status = health_checker.get_status(server.name)
-                if "error" not in health_status:
-                    server_info["health_check"] = {
-                        "last_check": health_status.get("last_check"),
-                        "response_time": health_status.get("response_time"),
-                        "healthy_count": health_status.get("healthy_count"),
-                        "unhealthy_count": health_status.get("unhealthy_count")
-                    }
-                
-                servers.append(server_info)
-            
-            return jsonify({
-                "servers": servers,
-                "total_count": len(servers),
-                "healthy_count": sum(1 for s in servers if s["healthy"]),
-                "timestamp": time.time()
-            })
+                health_summary = get_summary(server.name)
+                if health_summary is not None:
+                    server_info["health_check"] = health_summary
             
-        except Exception as e:
-            logger.error(f"Error getting servers: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+            if index:
+                yield b','
+            yield _dumps(server_info)
+        
+        yield b'],' + _dumps({
+            "total_count": len(servers),
+            "healthy_count": healthy_count,
+            "timestamp": time.time()
+        })[1:]
+    
+    @api_bp.route('/servers', methods=['GET'])
+    def get_servers():
+        """Get all servers and their status (pass ?brief=1 for a lighter listing)."""
+        if _flag(request.args, 'brief'):
+            return response_cache.get_stream('servers_brief', lambda: generate_servers_payload(brief=True))
+        return response_cache.get_stream('servers', generate_servers_payload)
     
     @api_bp.route('/servers', methods=['POST'])
     def add_server():
         """Add a new server to the load balancer."""
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({"error": "No JSON data provided"}), 400
-            
-            # Validate required fields
-            required_fields = ["name", "address", "port"]
-            for field in required_fields:
-                if field not in data:
-                    return jsonify({"error": f"Missing required field: {field}"}), 400
-            
-            # Validate data types
-            try:
-                port = int(data["port"])
-                weight = int(data.get("weight", 1))
-            except ValueError:
-                return jsonify({"error": "Port and weight must be integers"}), 400
-            
-            if port <= 0 or port > 65535:
-                return jsonify({"error": "Port must be between 1 and 65535"}), 400
-            
-            if weight <= 0:
-                return jsonify({"error": "Weight must be positive"}), 400
-            
-            # Check if server already exists
-            existing_servers = load_balancer.get_all_servers()
-            if any(s.name == data["name"] for s in existing_servers):
-                return jsonify({"error": f"Server with name '{data['name']}' already exists"}), 409
-            
-            # Create server
-            server = Server(
-                name=data["name"],
-                address=data["address"],
-                port=port,
-                weight=weight
-            )
-            
-            # Add to load balancer
-            load_balancer.add_server(server)
-            
-            # Add to health checker
-            health_checker.add_server(
-                server_id=server.name,
-                server_info={
-                    "address": server.address,
-                    "port": server.port
-                },
-                check_type=data.get("health_check_type", "tcp"),
-                check_endpoint=data.get("health_check_endpoint", "/health"),
-                expected_status=data.get("expected_status", 200)
-            )
-            
-            logger.info(f"Added server {server.name} ({server.address}:{server.port})")
-            
-            return jsonify({
-                "message": f"Server {server.name} added successfully",
-                "server": {
-                    "name": server.name,
-                    "address": server.address,
-                    "port": server.port,
-                    "weight": server.weight,
-                    "url": server.get_url()
-                }
-            }), 201
-            
-        except Exception as e:
-            logger.error(f"Error adding server: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        data = _read_json()
+        if not data:
+            return _json({"error": "No JSON data provided"}, 400)
+        
+        server, error = _parse_server(data)
+        if error:
+            return _json({"error": error}, 400)
+        
+        # Add to load balancer, refusing to overwrite an existing server
+        if not load_balancer.add_server(server, replace=False):
+            return _json({"error": f"Server with name '{data['name']}' already exists"}, 409)
+        
+        # Add to health checker
+        _watch_server(health_checker, server, data)
+        
+        logger.info("Added server %s (%s:%s)", server.name, server.address, server.port)
+        
+        return _json({
+            "message": f"Server {server.name} added successfully",
+            "server": server.get_static_info()
+        }, 201)
     
-    @api_bp.route('/servers/<server_name>', methods=['GET'])
+    @api_bp.route('/servers/bulk', methods=['POST'])
+    def bulk_update_servers():
+        """Add and remove several servers with a single hash ring rebuild."""
+        data = _read_json()
+        if not data or not isinstance(data, dict):
+            return _json({"error": "No JSON data provided"}, 400)
+        
+        add_data = data.get("add", [])
+        remove_names = data.get("remove", [])
+        if not isinstance(add_data, list) or not isinstance(remove_names, list):
+            return _json({"error": "'add' and 'remove' must be lists"}, 400)
+        if not all(isinstance(name, str) for name in remove_names):
+            return _json({"error": "'remove' must be a list of server names"}, 400)
+        
+        # Validate everything up front so a bad entry leaves the pool untouched
+        servers = []
+        for index, server_data in enumerate(add_data):
+            server, error = _parse_server(server_data)
+            if error:
+                return _json({"error": f"Invalid server at add[{index}]: {error}"}, 400)
+            servers.append(server)
+        
+        result = load_balancer.bulk_mutate(add=servers, remove=remove_names)
+        
+        # Keep the health checker in sync with the pool
+        for server_name in result["removed"]:
+            health_checker.remove_server(server_name)
+        added = set(result["added"])
+        for server, server_data in zip(servers, add_data):
+            if server.name in added:
+                added.discard(server.name)
+                _watch_server(health_checker, server, server_data)
+        
+        return _json(result)
+    
+    @api_bp.route('/servers/<server_name:server_name>', methods=['GET'])
     def get_server(server_name: str):
         """Get information about a specific server."""
-        try:
-            servers = load_balancer.get_all_servers()
-            server = next((s for s in servers if s.name == server_name), None)
-            
-            if not server:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            server_info = {
-                "name": server.name,
-                "address": server.address,
-                "port": server.port,
-                "weight": server.weight,
-                "healthy": server.healthy,
-                "last_health_check": server.last_health_check,
-                "request_count": server.request_count,
-                "error_count": server.error_count,
-                "average_response_time": server.get_average_response_time(),
-                "url": server.get_url(),
-                "error_rate": (
-                    server.error_count / server.request_count 
-                    if server.request_count > 0 else 0
-                )
-            }
-            
-            # Add health check details
-            health_status = health_checker.get_status(server_name)
-            if "error" not in health_status:
-                server_info["health_check"] = health_status
-            
-            return jsonify(server_info)
-            
-        except Exception as e:
-            logger.error(f"Error getting server {server_name}: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        server = load_balancer.get_server_by_name(server_name)
+        
+        if not server:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        server_info = _server_info(server)
+        
+        # Add health check details
+        health_status = health_checker.get_status(server_name)
+        if "error" not in health_status:
+            server_info["health_check"] = health_status
+        
+        return _json(server_info)
     
-    @api_bp.route('/servers/<server_name>', methods=['PUT'])
+    @api_bp.route('/servers/<server_name:server_name>', methods=['PUT'])
     def update_server(server_name: str):
         """Update server configuration."""
-        try:
-            data = request.get_json()
-            if not data:
-                return jsonify({"error": "No JSON data provided"}), 400
-            
-            servers = load_balancer.get_all_servers()
-            server = next((s for s in servers if s.name == server_name), None)
-            
-            if not server:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            # Update allowed fields
-            updated_fields = []
-            
-            if "weight" in data:
-                try:
-                    new_weight = int(data["weight"])
-                    if new_weight <= 0:
-                        return jsonify({"error": "Weight must be positive"}), 400
-                    
-                    # Remove and re-add server with new weight
-                    load_balancer.remove_server(server_name)
-                    server.weight = new_weight
-                    load_balancer.add_server(server)
-                    updated_fields.append("weight")
-                    
-                except ValueError:
-                    return jsonify({"error": "Weight must be an integer"}), 400
-            
-            return jsonify({
-                "message": f"Server {server_name} updated successfully",
-                "updated_fields": updated_fields
-            })
-            
-        except Exception as e:
-            logger.error(f"Error updating server {server_name}: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        data = _read_json()
+        if not data:
+            return _json({"error": "No JSON data provided"}, 400)
+        
+        server = load_balancer.get_server_by_name(server_name)
+        
+        if not server:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        # Update allowed fields
+        updated_fields = []
+        
+        if "weight" in data:
+            try:
+                new_weight = int(data["weight"])
+                if new_weight <= 0:
+                    return _json({"error": "Weight must be positive"}, 400)
+                
+                # Remove and re-add server with new weight
+                load_balancer.remove_server(server_name)
+                server.weight = new_weight
+                server.refresh_static_info()
+                load_balancer.add_server(server)
+                updated_fields.append("weight")
+                
+            except ValueError:
+                return _json({"error": "Weight must be an integer"}, 400)
+        
+        return _json({
+            "message": f"Server {server_name} updated successfully",
+            "updated_fields": updated_fields
+        })
     
-    @api_bp.route('/servers/<server_name>', methods=['DELETE'])
+    @api_bp.route('/servers/<server_name:server_name>', methods=['DELETE'])
     def remove_server(server_name: str):
         """Remove a server from the load balancer."""
-        try:
-            # Remove from load balancer
-            success = load_balancer.remove_server(server_name)
-            if not success:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            # Remove from health checker
-            health_checker.remove_server(server_name)
-            
-            logger.info(f"Removed server {server_name}")
-            
-            return jsonify({"message": f"Server {server_name} removed successfully"})
-            
-        except Exception as e:
-            logger.error(f"Error removing server {server_name}: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        # Remove from load balancer
+        success = load_balancer.remove_server(server_name)
+        if not success:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        # Remove from health checker
+        health_checker.remove_server(server_name)
+        
+        logger.info("Removed server %s", server_name)
+        
+        return _json({"message": f"Server {server_name} removed successfully"})
     
-    @api_bp.route('/servers/<server_name>/health', methods=['PUT'])
+    @api_bp.route('/servers/<server_name:server_name>/health', methods=['PUT'])
     def set_server_health(server_name: str):
         """Manually set server health status."""
-        try:
-            data = request.get_json()
-            if not data or "healthy" not in data:
-                return jsonify({"error": "Missing 'healthy' field in JSON data"}), 400
-            
-            healthy = bool(data["healthy"])
-            success = load_balancer.mark_server_status(server_name, healthy)
-            
-            if not success:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            status = "healthy" if healthy else "unhealthy"
-            logger.info(f"Manually set server {server_name} as {status}")
-            
-            return jsonify({"message": f"Server {server_name} marked as {status}"})
-            
-        except Exception as e:
-            logger.error(f"Error setting server health: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        data = _read_json()
+        if not data or "healthy" not in data:
+            return _json({"error": "Missing 'healthy' field in JSON data"}, 400)
+        
+        # Strings like "false" are truthy, so only accept real booleans
+        healthy = data["healthy"]
+        if not isinstance(healthy, bool):
+            return _json({"error": "'healthy' must be a boolean"}, 400)
+        
+        success = load_balancer.mark_server_status(server_name, healthy)
+        
+        if not success:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        status = "healthy" if healthy else "unhealthy"
+        logger.info("Manually set server %s as %s", server_name, status)
+        
+        return _json({"message": f"Server {server_name} marked as {status}"})
+    
+    def build_stats_payload() -> Tuple[Dict[str, Any], int]:
+        """Build the payload for the statistics endpoint."""
+        stats = load_balancer.get_full_stats()
+        stats["timestamp"] = time.time()
+        
+        return stats, 200
     
     @api_bp.route('/stats', methods=['GET'])
     def get_stats():
         """Get comprehensive load balancer statistics."""
-        try:
-            # Get basic stats
-            stats = load_balancer.get_stats()
-            
-            # Add detailed server stats
-            servers = load_balancer.get_all_servers()
-            server_stats = []
-            
-            for server in servers:
-                server_stat = {
-                    "name": server.name,
-                    "healthy": server.healthy,
-                    "request_count": server.request_count,
-                    "error_count": server.error_count,
-                    "average_response_time": server.get_average_response_time()
-                }
-                server_stats.append(server_stat)
-            
-            stats["servers"] = server_stats
-            stats["timestamp"] = time.time()
-            
-            return jsonify(stats)
-            
-        except Exception as e:
-            logger.error(f"Error getting stats: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        return response_cache.get('stats', build_stats_payload)
+    
+    def build_health_payload() -> Tuple[Dict[str, Any], int]:
+        """Build the payload for the load balancer health endpoint."""
+        healthy_servers, total_servers = load_balancer.get_counts()
+        
+        if healthy_servers > 0:
+            return {
+                "status": "healthy",
+                "healthy_servers": healthy_servers,
+                "total_servers": total_servers,
+                "timestamp": time.time()
+            }, 200
+        else:
+            return {
+                "status": "unhealthy",
+                "healthy_servers": healthy_servers,
+                "total_servers": total_servers,
+                "message": "No healthy backend servers available",
+                "timestamp": time.time()
+            }, 503
     
     @api_bp.route('/health', methods=['GET'])
     def health_check():
         """Health check endpoint for the load balancer itself."""
         try:
-            stats = load_balancer.get_stats()
-            healthy_servers = stats.get("healthy_servers", 0)
-            total_servers = stats.get("total_servers", 0)
-            
-            if healthy_servers > 0:
-                return jsonify({
-                    "status": "healthy",
-                    "healthy_servers": healthy_servers,
-                    "total_servers": total_servers,
-                    "timestamp": time.time()
-                })
-            else:
-                return jsonify({
-                    "status": "unhealthy",
-                    "healthy_servers": healthy_servers,
-                    "total_servers": total_servers,
-                    "message": "No healthy backend servers available",
-                    "timestamp": time.time()
-                }), 503
-                
+            return response_cache.get('health', build_health_payload)
         except Exception as e:
-            logger.error(f"Error in health check: {e}")
-            return jsonify({
+            logger.error("Error in health check: %s", e)
+            return _json({
                 "status": "error",
                 "error": str(e),
                 "timestamp": time.time()
-            }), 500
+            }, 500)
     
     @api_bp.route('/debug/lookup/<key>', methods=['GET'])
     def debug_lookup(key: str):
         """Debug endpoint to see which server a key maps to."""
-        try:
-            server = load_balancer.get_server(key)
-            
-            # Also get multiple servers for comparison
-            multiple_servers = load_balancer.consistent_hash.get_nodes(key, 3)
-            
-            result = {
-                "key": key,
-                "hash_value": load_balancer.consistent_hash.hash_func(key),
-                "selected_server": None,
-                "candidate_servers": multiple_servers
+        consistent_hash = load_balancer.consistent_hash
+        server = load_balancer.get_server(key)
+        
+        # Also get multiple servers for comparison
+        multiple_servers = load_balancer.get_candidates(key, 3)
+        
+        result = {
+            "key": key,
+            "hash_value": consistent_hash.hash_func(key),
+            "selected_server": None,
+            "candidate_servers": multiple_servers
+        }
+        
+        if server:
+            result["selected_server"] = {
+                "name": server.name,
+                "address": server.address,
+                "port": server.port,
+                "healthy": server.healthy,
+                "url": server.get_url()
             }
-            
-            if server:
-                result["selected_server"] = {
-                    "name": server.name,
-                    "address": server.address,
-                    "port": server.port,
-                    "healthy": server.healthy,
-                    "url": server.get_url()
-                }
-            else:
-                result["message"] = "No healthy servers available"
-            
-            return jsonify(result)
-                
-        except Exception as e:
-            logger.error(f"Error in debug lookup: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        else:
+            result["message"] = "No healthy servers available"
+        
+        return _json(result)
     
     @api_bp.route('/debug/ring', methods=['GET'])
     def debug_ring():
         """Debug endpoint to view the hash ring state."""
-        try:
-            ring_info = {
-                "total_nodes": len(load_balancer.consistent_hash.ring),
-                "physical_servers": list(load_balancer.consistent_hash.nodes.keys()),
-                "virtual_nodes_per_server": {
-                    name: len(nodes) 
-                    for name, nodes in load_balancer.consistent_hash.nodes.items()
-                }
+        # Alias the ring structures per call; they are replaced on bulk updates
+        consistent_hash = load_balancer.consistent_hash
+        ring = consistent_hash.ring
+        nodes = consistent_hash.nodes
+        
+        ring_info = {
+            "total_nodes": len(ring),
+            "physical_servers": list(nodes.keys()),
+            "virtual_nodes_per_server": {
+                name: len(hash_values) 
+                for name, hash_values in nodes.items()
             }
-            
-            # Add ring visualization (limited to avoid huge responses)
-            if request.args.get('include_ring') == 'true':
-                ring_items = []
-                for hash_val in sorted(load_balancer.consistent_hash.sorted_keys[:100]):  # Limit to first 100
-                    ring_items.append({
-                        "hash": hash_val,
-                        "server": load_balancer.consistent_hash.ring[hash_val]
-                    })
-                ring_info["ring_sample"] = ring_items
-                ring_info["note"] = "Only showing first 100 virtual nodes"
-            
-            return jsonify(ring_info)
-            
-        except Exception as e:
-            logger.error(f"Error getting ring debug info: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        }
+        
+        # Add ring visualization (limited to avoid huge responses)
+        if _flag(request.args, 'include_ring'):
+            # sorted_keys is kept in ascending order, so no re-sort is needed
+            keys = consistent_hash.sorted_keys[:100]  # Limit to first 100
+            ring_info["ring_sample"] = [{"hash": k, "server": ring[k]} for k in keys]
+            ring_info["note"] = "Only showing first 100 virtual nodes"
+        
+        return _json(ring_info)
     
     return api_bp
 
@@ -410,48 +648,33 @@ def create_management_routes(load_balancer: LoadBalancer, health_checker: Health
         A Flask Blueprint with management routes.
     """
     mgmt_bp = Blueprint('management', __name__, url_prefix='/manage')
+    mgmt_bp.register_error_handler(Exception, _handle_unexpected_error)
+    mgmt_bp.record_once(_register_converters)
     
     @mgmt_bp.route('/reset', methods=['POST'])
     def reset_stats():
         """Reset all server statistics."""
-        try:
-            for server in load_balancer.get_all_servers():
-                server.request_count = 0
-                server.error_count = 0
-                server.response_times = []
-            
-            return jsonify({"message": "Statistics reset successfully"})
-            
-        except Exception as e:
-            logger.error(f"Error resetting stats: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        for server in load_balancer.get_all_servers():
+            server.reset_stats()
+        
+        return _json({"message": "Statistics reset successfully"})
     
-    @mgmt_bp.route('/drain/<server_name>', methods=['POST'])
+    @mgmt_bp.route('/drain/<server_name:server_name>', methods=['POST'])
     def drain_server(server_name: str):
         """Drain a server (mark as unhealthy to stop new requests)."""
-        try:
-            success = load_balancer.mark_server_status(server_name, False)
-            if not success:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            return jsonify({"message": f"Server {server_name} is now draining (marked unhealthy)"})
-            
-        except Exception as e:
-            logger.error(f"Error draining server: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        success = load_balancer.mark_server_status(server_name, False)
+        if not success:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        return _json({"message": f"Server {server_name} is now draining (marked unhealthy)"})
     
-    @mgmt_bp.route('/enable/<server_name>', methods=['POST'])
+    @mgmt_bp.route('/enable/<server_name:server_name>', methods=['POST'])
     def enable_server(server_name: str):
         """Enable a server (mark as healthy)."""
-        try:
-            success = load_balancer.mark_server_status(server_name, True)
-            if not success:
-                return jsonify({"error": f"Server {server_name} not found"}), 404
-            
-            return jsonify({"message": f"Server {server_name} is now enabled (marked healthy)"})
-            
-        except Exception as e:
-            logger.error(f"Error enabling server: {e}")
-            return jsonify({"error": "Internal server error"}), 500
+        success = load_balancer.mark_server_status(server_name, True)
+        if not success:
+            return _json({"error": f"Server {server_name} not found"}, 404)
+        
+        return _json({"message": f"Server {server_name} is now enabled (marked healthy)"})
     
     return mgmt_bp
\ No newline at end of file
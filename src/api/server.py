@@ -6,19 +6,27 @@ It exposes endpoints for load balancing, server management, and monitoring.
 """
 
 import logging
-import time
-from typing import Dict, Any, Optional
-from flask import Flask, request, jsonify, redirect, Response
-import requests
-from werkzeug.exceptions import NotFound, BadRequest, InternalServerError
+from flask import Flask, jsonify
+import urllib3
+from werkzeug.exceptions import BadRequest
+try:
+    import waitress  # Production-grade multi-threaded WSGI server
+except ImportError:
+    # Make waitress optional since it requires installation
+    waitress = None
 
 from ..core.load_balancer import LoadBalancer
 from ..utils.health_check import HealthChecker
+from .proxy import ProxyMiddleware, PROXY_METHODS
 from .routes import create_api_routes, create_management_routes
 
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizes for proxying to the backend servers
+POOL_CONNECTIONS = 64  # Number of backend hosts with a cached pool
+POOL_MAXSIZE = 256  # Keep-alive connections kept per backend host
+
 
 class APIServer:
     """
@@ -37,7 +45,8 @@ class APIServer:
         health_checker: HealthChecker,
         host: str = "0.0.0.0",
         port: int = 8080,
-        debug: bool = False
+        debug: bool = False,
+        threads: int = 8
     ):
         """
         Initialize the API server.
@@ -47,13 +56,18 @@ class APIServer:
             health_checker: The HealthChecker instance.
             host: The host to bind to.
             port: The port to bind to.
-            debug: Whether to enable debug mode.        
+            debug: Whether to enable debug mode.
+            threads: The number of worker threads when serving with waitress.
         """
         self.load_balancer = load_balancer
         self.health_checker = health_checker
         self.host = host
         self.port = port
         self.debug = debug
+        self.threads = threads
+        
+        # Shared connection pool so proxied requests reuse keep-alive connections
+        self.http = self._create_http_pool()
         
         # Create Flask app
         self.app = Flask(__name__)
@@ -63,7 +77,24 @@ class APIServer:
         self._setup_routes()
         
         # Set up error handlers
-        self._setup_error_handlers()        
+        self._setup_error_handlers()
+        
+        # Proxy requests before they reach Flask's routing
+        self.app.wsgi_app = ProxyMiddleware(self.app.wsgi_app, self.load_balancer, self.http)
+    
+    def _create_http_pool(self) -> urllib3.PoolManager:
+        """
+        Create the connection pool used to forward requests.
+        
+        Returns:
+            A urllib3 PoolManager with a keep-alive pool per backend host.
+        """
+        return urllib3.PoolManager(
+            num_pools=POOL_CONNECTIONS,
+            maxsize=max(POOL_MAXSIZE, self.threads),
+            retries=False
+        )
+    
     def _setup_routes(self):
         """Set up API routes."""
         
@@ -75,15 +106,13 @@ class APIServer:
         mgmt_routes = create_management_routes(self.load_balancer, self.health_checker)
         self.app.register_blueprint(mgmt_routes)
         
-        # Load balancing endpoint (catch-all for proxying)
-        @self.app.route('/', defaults={'path': ''}, methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
-        @self.app.route('/<path:path>', methods=['GET', 'POST', 'PUT', 'DELETE', 'PATCH'])
-        def proxy_request(path):
-            """Proxy requests to backend servers."""
-            # Skip API and management routes
-            if path.startswith('api/') or path.startswith('manage/'):
-                return jsonify({"error": "Route not found"}), 404
-            return self._handle_proxy_request(path)
+        # Catch-all for unknown API and management routes; every other path
+        # is proxied by ProxyMiddleware before it reaches Flask
+        @self.app.route('/', defaults={'path': ''}, methods=sorted(PROXY_METHODS))
+        @self.app.route('/<path:path>', methods=sorted(PROXY_METHODS))
+        def route_not_found(path):
+            """Report unknown API and management routes."""
+            return jsonify({"error": "Route not found"}), 404
     
     def _setup_error_handlers(self):
         """Set up error handlers."""
@@ -100,80 +129,17 @@ class APIServer:
         def bad_request(error):
             return jsonify({"error": "Bad request", "message": str(error)}), 400
     
-    def _handle_proxy_request(self, path: str) -> Response:
+    def run(self):
         """
-        Handle proxying a request to a backend server.
+        Start the API server.
         
-        Args:
-            path: The request path.
-            
-        Returns:
-            A Flask Response object.
+        Serves with waitress when it is installed and debug mode is off,
+        otherwise falls back to the Flask development server.
         """
-        try:
-            # Determine the key for consistent hashing
-            # Use client IP + path as the key
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-            key = f"{client_ip}:{path}"
-            
-            # Get the server for this key
-            server = self.load_balancer.get_server(key)
-            if not server:
-                return jsonify({"error": "No healthy servers available"}), 503
-            
-            # Build the target URL
-            target_url = f"{server.get_url()}/{path}"
-            if request.query_string:
-                target_url += f"?{request.query_string.decode('utf-8')}"
-            
-            # Record request start time
-            start_time = time.time()
-            
-            try:
-                # Forward the request
-                response = requests.request(
-                    method=request.method,
-                    url=target_url,
-                    headers={key: value for key, value in request.headers if key != 'Host'},
-                    data=request.get_data(),
-                    params=request.args,
-                    allow_redirects=False,
-                    timeout=30
-                )
-                
-                # Record successful request
-                response_time = time.time() - start_time
-                server.record_request(response_time)
-                
-                # Create Flask response
-                flask_response = Response(
-                    response.content,
-                    status=response.status_code,
-                    headers=dict(response.headers)
-                )
-                # Add load balancer headers
-                flask_response.headers['X-Load-Balancer-Server'] = server.name
-                flask_response.headers['X-Load-Balancer-Response-Time'] = f"{response_time:.3f}"
-                
-                return flask_response
-                
-            except requests.exceptions.RequestException as e:
-                # Record failed request
-                response_time = time.time() - start_time
-                server.record_error()
-                
-                logger.error(f"Error forwarding request to {server.name}: {e}")
-                return jsonify({
-                    "error": "Backend server error",
-                    "server": server.name,
-                    "message": str(e)
-                }), 502
-                
-        except Exception as e:
-            logger.error(f"Error handling proxy request: {e}")
-            return jsonify({"error": "Internal server error"}), 500
-    
-    def run(self):
-        """Start the API server."""
-        logger.info(f"Starting API server on {self.host}:{self.port}")
-        self.app.run(host=self.host, port=self.port, debug=self.debug)
\ No newline at end of file
+        if waitress is not None and not self.debug:
+            logger.info("Starting API server on %s:%s (waitress, %d threads)", self.host, self.port, self.threads)
+            waitress.serve(self.app, host=self.host, port=self.port, threads=self.threads)
+            return
+        
+        logger.info("Starting API server on %s:%s", self.host, self.port)
+        self.app.run(host=self.host, port=self.port, debug=self.debug, threaded=True)
\ No newline at end of file
@@ -7,7 +7,12 @@ nodes are added or removed from the system.
 """
 
 import bisect
-from typing import Dict, List, Optional, Any, Callable
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Callable, Tuple
+
+from .virtual_node import virtual_node_hashes
+
+VIRTUAL_NODES_PER_WEIGHT = 100  # Virtual nodes per weight unit
 
 
 class ConsistentHash:
@@ -16,6 +21,10 @@ class ConsistentHash:
     
     This class provides methods to add and remove nodes from the hash ring,
     as well as to find the appropriate node for a given key.
+    
+    Mutations build new sorted lists and publish them in one assignment, so
+    lookups can run without a lock while another thread changes the ring.
+    Mutations themselves must still be serialized by the caller.
     """
     
     def __init__(self, hash_func: Callable[[str], int]):
@@ -28,8 +37,63 @@ class ConsistentHash:
         self.hash_func = hash_func
         self.ring = {}  # Hash value -> Node mapping
         self.sorted_keys = []  # Sorted list of hash values for binary search
+        self.sorted_nodes = []  # Node names aligned with sorted_keys
+        self._next_distinct = []  # Offset from each position to the next different node
+        # (sorted_keys, sorted_nodes, _next_distinct, distinct node count) as read by lookups
+        self._lookup = ([], [], [], 0)
         self.nodes = {}  # Node name -> List of hash values
     
+    def _publish(self, sorted_keys: List[int], sorted_nodes: List[str]) -> None:
+        """Replace the sorted lists, publishing them to lookups atomically."""
+        next_distinct = self._build_next_distinct(sorted_nodes)
+        self.sorted_keys = sorted_keys
+        self.sorted_nodes = sorted_nodes
+        self._next_distinct = next_distinct
+        self._lookup = (sorted_keys, sorted_nodes, next_distinct, len(set(sorted_nodes)))
+    
+    @staticmethod
+    def _build_next_distinct(sorted_nodes: List[str]) -> List[int]:
+        """
+        Compute, for each ring position, how far clockwise the next position
+        owned by a different node is.
+        
+        Built with one reverse scan that starts just before a node boundary, so
+        runs that wrap around the end of the ring are counted correctly. When the
+        ring holds a single node every offset is the ring size.
+        
+        Args:
+            sorted_nodes: Node names in ring order.
+            
+        Returns:
+            A list of offsets aligned with sorted_nodes.
+        """
+        size = len(sorted_nodes)
+        
+        # Find a position whose clockwise neighbour belongs to a different node
+        boundary = next(
+            (i for i in range(size) if sorted_nodes[i] != sorted_nodes[(i + 1) % size]),
+            None
+        )
+        if boundary is None:
+            return [size] * size
+        
+        # Rotate so the boundary is last, which lets the scan run without wrapping
+        shift = boundary + 1
+        rotated = sorted_nodes[shift:] + sorted_nodes[:shift]
+        offsets = [1] * size
+        following = rotated[-1]
+        run = 1
+        for i in range(size - 2, -1, -1):
+            node = rotated[i]
+            if node == following:
+                run += 1
+            else:
+                run = 1
+                following = node
+            offsets[i] = run
+        
+        return offsets[size - shift:] + offsets[:size - shift]
+    
     def add_node(self, node_name: str, weight: int = 1) -> None:
         """
         Add a node to the hash ring.
@@ -42,16 +106,47 @@ class ConsistentHash:
         if node_name in self.nodes:
             return  # Node already exists
         
-        self.nodes[node_name] = []
-        
         # Create virtual nodes based on weight
-        for i in range(weight * 100):  # 100 virtual nodes per weight unit
-            virtual_node_name = f"{node_name}:{i}"
-            hash_value = self.hash_func(virtual_node_name)
+        hash_values = virtual_node_hashes(self.hash_func, node_name, weight * VIRTUAL_NODES_PER_WEIGHT)
+        self.nodes[node_name] = hash_values
+        self.ring.update(dict.fromkeys(hash_values, node_name))
+        
+        # The old keys are one sorted run, so the sort merges rather than
+        # re-sorting; owners come from the ring so the latest owner wins
+        sorted_keys = self.sorted_keys + hash_values
+        sorted_keys.sort()
+        ring = self.ring
+        self._publish(sorted_keys, [ring[hash_value] for hash_value in sorted_keys])
+    
+    def update_nodes(
+        self,
+        add: Iterable[Tuple[str, int]] = (),
+        remove: Iterable[str] = ()
+    ) -> None:
+        """
+        Remove and add several nodes with a single rebuild of the sorted keys.
+        
+        Rebuilding once is O(M log M) for a ring of M virtual nodes, instead of
+        an insertion or linear removal per virtual node.
+        
+        Args:
+            add: (node_name, weight) pairs to add. Existing nodes are skipped.
+            remove: The identifiers of the nodes to remove, applied before additions.
+        """
+        for node_name in remove:
+            for hash_value in self.nodes.pop(node_name, []):
+                self.ring.pop(hash_value, None)
+        
+        for node_name, weight in add:
+            if node_name in self.nodes:
+                continue
             
-            self.ring[hash_value] = node_name
-            self.nodes[node_name].append(hash_value)
-            bisect.insort(self.sorted_keys, hash_value)
+            hash_values = virtual_node_hashes(self.hash_func, node_name, weight * VIRTUAL_NODES_PER_WEIGHT)
+            self.ring.update(dict.fromkeys(hash_values, node_name))
+            self.nodes[node_name] = hash_values
+        
+        sorted_keys = sorted(self.ring)
+        self._publish(sorted_keys, [self.ring[hash_value] for hash_value in sorted_keys])
     
     def remove_node(self, node_name: str) -> None:
         """
@@ -63,13 +158,19 @@ class ConsistentHash:
         if node_name not in self.nodes:
             return  # Node doesn't exist
         
-        # Remove all virtual nodes
-        for hash_value in self.nodes[node_name]:
-            self.ring.pop(hash_value)
-            self.sorted_keys.remove(hash_value)
+        removed = set(self.nodes.pop(node_name))
+        
+        # Rebuild the ring in one pass when a large share of it goes away
+        if len(removed) * 10 > len(self.ring):
+            self.ring = {h: n for h, n in self.ring.items() if h not in removed}
+        else:
+            for hash_value in removed:
+                self.ring.pop(hash_value, None)
         
-        # Remove the node from nodes dict
-        self.nodes.pop(node_name)
+        # Filter the sorted keys in one pass instead of deleting per virtual node
+        sorted_keys = [h for h in self.sorted_keys if h not in removed]
+        ring = self.ring
+        self._publish(sorted_keys, [ring[hash_value] for hash_value in sorted_keys])
     
     def get_node(self, key: str) -> Optional[str]:
         """
@@ -82,14 +183,53 @@ class ConsistentHash:
             The name of the node responsible for the key,
             or None if no nodes exist.
         """
-        if not self.ring:
+        sorted_keys, sorted_nodes, _, _ = self._lookup
+        if not sorted_keys:
             return None
         
         hash_value = self.hash_func(key)
         
-        # Find the first point in the ring >= hash_value
-        idx = bisect.bisect_left(self.sorted_keys, hash_value) % len(self.sorted_keys)
-        return self.ring[self.sorted_keys[idx]]
+        # Find the first point in the ring >= hash_value, wrapping around at the end.
+        # bisect is implemented in C, so the search itself costs less than the hash.
+        idx = bisect.bisect_left(sorted_keys, hash_value)
+        if idx == len(sorted_keys):
+            idx = 0
+        return sorted_nodes[idx]
+    
+    def iter_nodes(self, key: str) -> Iterator[str]:
+        """
+        Lazily yield the distinct nodes for the given key in ring order.
+        
+        Uses the next-distinct offsets to skip runs of virtual nodes owned by
+        the same node, so callers that stop early (such as when looking for
+        the first healthy node) don't walk the whole ring.
+        
+        Args:
+            key: The key to look up.
+            
+        Yields:
+            Node names, starting with the node responsible for the key.
+        """
+        sorted_keys, sorted_nodes, next_distinct, node_count = self._lookup
+        if not sorted_keys:
+            return
+        
+        size = len(sorted_keys)
+        idx = bisect.bisect_left(sorted_keys, self.hash_func(key)) % size
+        
+        visited = set()
+        travelled = 0
+        while travelled < size:
+            node = sorted_nodes[idx]
+            if node not in visited:
+                visited.add(node)
+                yield node
+                # Stop as soon as every node was seen instead of finishing the lap
+                if len(visited) == node_count:
+                    return
+            offset = next_distinct[idx]
+            travelled += offset
+            idx = (idx + offset) % size
     
     def get_nodes(self, key: str, count: int) -> List[str]:
         """
@@ -103,24 +243,6 @@ class ConsistentHash:
         Returns:
             A list of node names responsible for the key.
         """
-        if not self.ring or count <= 0:
+        if count <= 0:
             return []
-        
-        if count > len(set(self.ring.values())):
-            count = len(set(self.ring.values()))
-        
-        hash_value = self.hash_func(key)
-        idx = bisect.bisect_left(self.sorted_keys, hash_value) % len(self.sorted_keys)
-        
-        unique_nodes = []
-        visited = set()
-        
-        for i in range(len(self.sorted_keys)):
-            node = self.ring[self.sorted_keys[(idx + i) % len(self.sorted_keys)]]
-            if node not in visited:
-                visited.add(node)
-                unique_nodes.append(node)
-                if len(unique_nodes) >= count:
-                    break
-        
-        return unique_nodes
\ No newline at end of file
+        return list(islice(self.iter_nodes(key), count))
\ No newline at end of file
@@ -5,16 +5,20 @@ This module provides a load balancer implementation that uses consistent hashing
 to distribute requests across multiple servers.
 """
 
-from typing import Dict, List, Optional, Callable, Any
+from typing import Dict, List, Optional, Callable, Any, Sequence, Tuple
 import time
 import threading
 import logging
+from collections import deque
+from functools import lru_cache
 
 from .consistent_hash import ConsistentHash
 
 
 logger = logging.getLogger(__name__)
 
+LOOKUP_CACHE_SIZE = 16384  # Keys remembered by LoadBalancer.get_server_cached
+
 
 class Server:
     """
@@ -24,6 +28,24 @@ class Server:
     and various metrics.
     """
     
+    RESPONSE_TIME_WINDOW = 100  # Number of recent response times kept
+    
+    # Slots keep instances small and make attribute access in hot loops cheaper
+    __slots__ = (
+        'name',
+        'address',
+        'port',
+        'weight',
+        'healthy',
+        'last_health_check',
+        'request_count',
+        'error_count',
+        'response_times',
+        '_response_time_sum',
+        'base_url',
+        '_static_info',
+    )
+    
     def __init__(self, name: str, address: str, port: int, weight: int = 1):
         """
         Initialize a new Server instance.
@@ -42,7 +64,9 @@ class Server:
         self.last_health_check = time.time()
         self.request_count = 0
         self.error_count = 0
-        self.response_times = []
+        self.response_times = deque(maxlen=self.RESPONSE_TIME_WINDOW)
+        self._response_time_sum = 0.0  # Running sum of response_times
+        self.refresh_static_info()
         
     def __str__(self) -> str:
         """String representation of a server."""
@@ -51,13 +75,39 @@ class Server:
     
     def get_url(self) -> str:
         """Get the full URL for this server."""
-        return f"http://{self.address}:{self.port}"
+        return self.base_url[:-1]
+    
+    def refresh_static_info(self) -> None:
+        """
+        Rebuild the cached dictionary of the server's static fields.
+        
+        Must be called after changing the server's address, port or weight.
+        Also refreshes base_url, the server URL with a trailing slash that
+        request paths are appended to.
+        """
+        self.base_url = f"http://{self.address}:{self.port}/"
+        self._static_info = {
+            "name": self.name,
+            "address": self.address,
+            "port": self.port,
+            "weight": self.weight,
+            "url": self.get_url()
+        }
+    
+    def get_static_info(self) -> Dict[str, Any]:
+        """
+        Get a copy of the server's static fields.
+        
+        Returns:
+            A new dictionary with the name, address, port, weight and URL.
+        """
+        return self._static_info.copy()
     
     def get_average_response_time(self) -> float:
         """Calculate the average response time for this server."""
         if not self.response_times:
             return 0.0
-        return sum(self.response_times) / len(self.response_times)
+        return self._response_time_sum / len(self.response_times)
     
     def record_request(self, response_time: Optional[float] = None):
         """
@@ -68,20 +118,34 @@ class Server:
         """
         self.request_count += 1
         if response_time is not None:
-            self.response_times.append(response_time)
-            # Keep only the most recent 100 response times
-            if len(self.response_times) > 100:
-                self.response_times.pop(0)
+            response_times = self.response_times
+            # The deque keeps only the most recent response times, so take the
+            # evicted value out of the running sum
+            if len(response_times) == response_times.maxlen:
+                self._response_time_sum -= response_times[0]
+            response_times.append(response_time)
+            self._response_time_sum += response_time
     
     def record_error(self):
         """Record that an error occurred when processing a request."""
         self.error_count += 1
+    
+    def reset_stats(self) -> None:
+        """Reset the request, error and response time metrics."""
+        self.request_count = 0
+        self.error_count = 0
+        self.response_times.clear()
+        self._response_time_sum = 0.0
 
 
 class LoadBalancer:
     """
     A load balancer that uses consistent hashing to distribute requests across servers.
     
+    While every server has the same weight, keys are mapped with Jump Consistent
+    Hash over an ordered server list, which needs no ring lookup. The virtual node
+    ring is always kept up to date and is used as soon as weights differ.
+    
     Features:
     - Consistent hashing for request distribution
     - Virtual nodes for better distribution
@@ -96,30 +160,51 @@ class LoadBalancer:
         Args:
             hash_func: A function that takes a string and returns an integer hash value.
         """
+        self.hash_func = hash_func
         self.consistent_hash = ConsistentHash(hash_func)
         self.servers: Dict[str, Server] = {}
-        self.lock = threading.RLock()  # For thread safety
+        # Copy of servers that read paths use without the lock
+        self._snapshot: Dict[str, Server] = {}
+        self.lock = threading.Lock()  # Serializes changes to the pool; reads use _snapshot
         self.health_check_interval = 10.0  # seconds
         self.health_checker_running = False
+        self.version = 0  # Bumped whenever the server pool or health changes
+        self._healthy_count = 0  # Maintained by the methods that change the pool or health
+        # Per-instance cache of (key, version) -> server name
+        self._cached_server_name = lru_cache(maxsize=LOOKUP_CACHE_SIZE)(self._lookup_server_name)
     
-    def add_server(self, server: Server) -> None:
+    def add_server(self, server: Server, replace: bool = True) -> bool:
         """
         Add a server to the load balancer.
         
         Args:
             server: The server to add.
+            replace: Whether to replace an existing server with the same name.
+            
+        Returns:
+            True if the server was added, False if a server with the same name
+            already exists and replace is False.
         """
         with self.lock:
-            if server.name in self.servers:
-                logger.warning(f"Server {server.name} already exists, updating configuration")
+            existing = self.servers.get(server.name)
+            if existing is not None:
+                if not replace:
+                    return False
+                logger.warning("Server %s already exists, updating configuration", server.name)
+                self._healthy_count -= existing.healthy
             
             self.servers[server.name] = server
+            self._healthy_count += server.healthy
             self.consistent_hash.add_node(server.name, server.weight)
-            logger.info(f"Added server {server}")
+            self._publish_snapshot()
+            self.version += 1
+            logger.info("Added server %s", server)
             
             # Start health checker if not already running
             if not self.health_checker_running:
                 self._start_health_checker()
+            
+            return True
     
     def remove_server(self, server_name: str) -> bool:
         """
@@ -133,14 +218,104 @@ class LoadBalancer:
         """
         with self.lock:
             if server_name not in self.servers:
-                logger.warning(f"Server {server_name} not found")
+                logger.warning("Server %s not found", server_name)
                 return False
             
             server = self.servers.pop(server_name)
+            self._healthy_count -= server.healthy
             self.consistent_hash.remove_node(server_name)
-            logger.info(f"Removed server {server}")
+            self._publish_snapshot()
+            self.version += 1
+            logger.info("Removed server %s", server)
             return True
     
+    def bulk_mutate(
+        self,
+        add: Optional[List[Server]] = None,
+        remove: Optional[List[str]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Add and remove several servers with a single hash ring rebuild.
+        
+        Removals are applied before additions, so a server can be replaced
+        by removing and re-adding it in the same call.
+        
+        Args:
+            add: The servers to add. Servers whose name already exists are skipped.
+            remove: The names of the servers to remove. Unknown names are skipped.
+            
+        Returns:
+            A dictionary with the names that were "added", "removed" and "skipped".
+        """
+        result = {"added": [], "removed": [], "skipped": []}
+        
+        with self.lock:
+            # Work out the whole change set before touching the pool, so a bad
+            # entry raises with the pool, ring and snapshot still in agreement
+            removed: Dict[str, Server] = {}
+            for server_name in remove or []:
+                server = None if server_name in removed else self.servers.get(server_name)
+                if server is None:
+                    result["skipped"].append(server_name)
+                else:
+                    removed[server_name] = server
+            
+            added: Dict[str, Server] = {}
+            for server in add or []:
+                name = server.name
+                if name in added or (name in self.servers and name not in removed):
+                    result["skipped"].append(name)
+                else:
+                    added[name] = server
+            
+            for server_name, server in removed.items():
+                del self.servers[server_name]
+                self._healthy_count -= server.healthy
+            for server in added.values():
+                self.servers[server.name] = server
+                self._healthy_count += server.healthy
+            result["removed"] = list(removed)
+            result["added"] = list(added)
+            
+            if added or removed:
+                self.consistent_hash.update_nodes(
+                    add=[(s.name, s.weight) for s in added.values()],
+                    remove=result["removed"]
+                )
+                self._publish_snapshot()
+                self.version += 1
+                logger.info(
+                    "Bulk update added %s and removed %s servers",
+                    len(result["added"]), len(result["removed"])
+                )
+            
+            # Start health checker if not already running
+            if self.servers and not self.health_checker_running:
+                self._start_health_checker()
+        
+        return result
+    
+    def _publish_snapshot(self) -> None:
+        """
+        Publish an immutable copy of the pool for lock-free lookups.
+        
+        Must be called with the lock held after every change to the pool.
+        """
+        self._snapshot = dict(self.servers)
+    
+    def get_candidates(self, key: str, count: int) -> List[str]:
+        """
+        Get the names of the servers a key maps to, in order of preference.
+        
+        Args:
+            key: The key to look up.
+            count: The maximum number of names to return.
+            
+        Returns:
+            The primary server's name followed by its fallbacks.
+        """
+        return self.consistent_hash.get_nodes(key, count)
+    
     def get_server(self, key: str) -> Optional[Server]:
         """
         Get the server that should handle the given key.
@@ -151,23 +326,89 @@ class LoadBalancer:
         Returns:
             The server that should handle the request, or None if no servers are available.
         """
-        with self.lock:
-            server_name = self.consistent_hash.get_node(key)
-            if not server_name or server_name not in self.servers:
-                return None
-            
-            server = self.servers[server_name]
+        # Read the published snapshot instead of taking the lock on every request
+        servers = self._snapshot
+        
+        if len(servers) == 1:
+            # Every key maps to the only server, so skip hashing
+            server = next(iter(servers.values()))
+            return server if server.healthy else None
+        
+        server = servers.get(self.consistent_hash.get_node(key))
+        if server is not None and server.healthy:
+            return server
+        
+        # Try to find the next healthy server. The ring may briefly list a
+        # server the snapshot doesn't have yet, which is skipped.
+        for name in self.consistent_hash.iter_nodes(key):
+            server = servers.get(name)
+            if server is not None and server.healthy:
+                return server
+        
+        # If no healthy servers found, return None
+        return None
+    
+    def get_servers_batch(self, keys: Sequence[str]) -> List[Optional[Server]]:
+        """
+        Get the servers that should handle each of the given keys.
+        
+        Equivalent to calling get_server for every key, but reads the snapshot
+        once and only falls back to get_server for keys whose primary is unhealthy.
+        
+        Args:
+            keys: The keys to look up.
+        
+        Returns:
+            The server for each key, in order, or None where no server is available.
+        """
+        snapshot = self._snapshot
+        get_server = self.get_server
+        if len(snapshot) <= 1:
+            return [get_server(key) for key in keys]
+        
+        get_node = self.consistent_hash.get_node
+        servers = [snapshot.get(get_node(key)) for key in keys]
+        for i, server in enumerate(servers):
+            if server is None or not server.healthy:
+                # Walk the ring like get_server does
+                servers[i] = get_server(keys[i])
+        return servers
+    
+    def _lookup_server_name(self, key: str, version: int) -> Optional[str]:
+        """Look up the name of the server for a key; version is only part of the cache key."""
+        server = self.get_server(key)
+        return server.name if server is not None else None
+    
+    def get_server_cached(self, key: str) -> Optional[Server]:
+        """
+        Get the server that should handle the given key, remembering recent keys.
+        
+        Results are cached per pool version, so adding or removing a server or
+        a health change through mark_server_status makes every cached entry stale.
+        Setting Server.healthy directly is not seen until the next version bump.
+        
+        Args:
+            key: The key to look up (e.g., client IP, request path).
             
-            # Don't return unhealthy servers
-            if not server.healthy:
-                # Try to find the next healthy server
-                for name in self.consistent_hash.get_nodes(key, len(self.servers)):
-                    if name in self.servers and self.servers[name].healthy:
-                        return self.servers[name]
-                # If no healthy servers found, return None
-                return None
+        Returns:
+            The server that should handle the request, or None if no servers are available.
+        """
+        server_name = self._cached_server_name(key, self.version)
+        if server_name is None:
+            return None
+        return self._snapshot.get(server_name)
+    
+    def get_server_by_name(self, server_name: str) -> Optional[Server]:
+        """
+        Look up a server by its name.
+        
+        Args:
+            server_name: The name of the server.
             
-            return server
+        Returns:
+            The server with the given name, or None if it doesn't exist.
+        """
+        return self._snapshot.get(server_name)
     
     def mark_server_status(self, server_name: str, healthy: bool) -> bool:
         """
@@ -182,14 +423,16 @@ class LoadBalancer:
         """
         with self.lock:
             if server_name not in self.servers:
-                logger.warning(f"Server {server_name} not found")
+                logger.warning("Server %s not found", server_name)
                 return False
             
             server = self.servers[server_name]
             if server.healthy != healthy:
                 server.healthy = healthy
+                self._healthy_count += 1 if healthy else -1
+                self.version += 1
                 status = "healthy" if healthy else "unhealthy"
-                logger.info(f"Server {server_name} is now {status}")
+                logger.info("Server %s is now %s", server_name, status)
             
             server.last_health_check = time.time()
             return True
@@ -210,20 +453,20 @@ class LoadBalancer:
                 time.sleep(self.health_check_interval)
                 self._check_all_servers()
         except Exception as e:
-            logger.error(f"Health checker failed: {e}")
+            logger.error("Health checker failed: %s", e)
         finally:
             self.health_checker_running = False
     
     def _check_all_servers(self) -> None:
         """Check the health of all servers."""
-        for server_name, server in list(self.servers.items()):
+        for server_name, server in self._snapshot.items():
             try:
                 # In a real implementation, we would make a health check request to the server
                 # For this example, we just assume the server is healthy
                 # self._check_server_health(server)
                 pass
             except Exception as e:
-                logger.error(f"Health check failed for {server_name}: {e}")
+                logger.error("Health check failed for %s: %s", server_name, e)
                 self.mark_server_status(server_name, False)
     
     def _check_server_health(self, server: Server) -> bool:
@@ -250,8 +493,21 @@ class LoadBalancer:
         Returns:
             A list of all servers.
         """
+        return list(self._snapshot.values())
+    
+    def get_counts(self) -> Tuple[int, int]:
+        """
+        Get the number of healthy and total servers in constant time.
+        
+        The healthy count is maintained by add_server, remove_server,
+        bulk_mutate and mark_server_status, so health changes must go
+        through mark_server_status to be reflected here.
+        
+        Returns:
+            A (healthy_servers, total_servers) tuple.
+        """
         with self.lock:
-            return list(self.servers.values())
+            return self._healthy_count, len(self.servers)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -260,16 +516,56 @@ class LoadBalancer:
         Returns:
             A dictionary with statistics.
         """
-        with self.lock:
-            total_requests = sum(s.request_count for s in self.servers.values())
-            total_errors = sum(s.error_count for s in self.servers.values())
-            healthy_count = sum(1 for s in self.servers.values() if s.healthy)
+        return self._collect_stats(include_servers=False)
+    
+    def get_full_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the load balancer including per-server statistics.
+        
+        Returns:
+            A dictionary with the same statistics as get_stats(), plus a
+            "servers" list with the statistics of each server.
+        """
+        return self._collect_stats(include_servers=True)
+    
+    def _collect_stats(self, include_servers: bool) -> Dict[str, Any]:
+        """
+        Collect load balancer statistics in a single pass over the servers.
+        
+        Reads the published snapshot, so it doesn't block changes to the pool.
+        
+        Args:
+            include_servers: Whether to include the per-server statistics.
             
-            return {
-                "total_servers": len(self.servers),
-                "healthy_servers": healthy_count,
-                "unhealthy_servers": len(self.servers) - healthy_count,
-                "total_requests": total_requests,
-                "total_errors": total_errors,
-                "error_rate": total_errors / total_requests if total_requests > 0 else 0
-            }
\ No newline at end of file
+        Returns:
+            A dictionary with statistics.
+        """
+        servers = self._snapshot
+        total_requests = 0
+        total_errors = 0
+        healthy_count = 0
+        server_stats = []
+        for server in servers.values():
+            total_requests += server.request_count
+            total_errors += server.error_count
+            healthy_count += server.healthy
+            if include_servers:
+                server_stats.append({
+                    "name": server.name,
+                    "healthy": server.healthy,
+                    "request_count": server.request_count,
+                    "error_count": server.error_count,
+                    "average_response_time": server.get_average_response_time()
+                })
+        
+        stats = {
+            "total_servers": len(servers),
+            "healthy_servers": healthy_count,
+            "unhealthy_servers": len(servers) - healthy_count,
+            "total_requests": total_requests,
+            "total_errors": total_errors,
+            "error_rate": total_errors / total_requests if total_requests > 0 else 0
+        }
+        if include_servers:
+            stats["servers"] = server_stats
+        return stats
@@ -5,11 +5,32 @@ This module provides the virtual node functionality for the consistent hashing a
 Virtual nodes are used to improve the distribution of keys across the nodes in the system.
 """
 
-from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, List, Optional
+
+
+def virtual_node_hashes(hash_func: Callable[[str], int], physical_node: str, count: int) -> List[int]:
+    """
+    Compute the ring positions of a physical node's virtual nodes.
+    
+    Virtual node i of a node is hashed as "<physical_node>:<i>". This is the single
+    place that naming scheme lives, shared by ConsistentHash and VirtualNodeManager.
+    Hash functions with a ``batch`` attribute hash all the names in one call.
+    
+    Args:
+        hash_func: A function that takes a string and returns an integer hash value.
+        physical_node: The name/ID of the physical node.
+        count: The number of virtual nodes.
+        
+    Returns:
+        The hash values of virtual nodes 0 to count-1, in order.
+    """
+    names = [f"{physical_node}:{i}" for i in range(count)]
+    batch = getattr(hash_func, 'batch', None)
+    if batch is not None:
+        return batch(names)
+    return list(map(hash_func, names))
 
 
-@dataclass
 class VirtualNode:
     """
     Represents a virtual node in the consistent hashing ring.
@@ -18,20 +39,39 @@ class VirtualNode:
     which helps in achieving a more balanced distribution of keys.
     """
     
-    # The name/ID of the physical node this virtual node represents
-    physical_node: str
-    
-    # A unique identifier for this virtual node
-    id: int
+    # Slots keep the weight * 100 instances per server small
+    __slots__ = ('physical_node', 'id', 'hash_value', 'weight', 'metadata')
     
-    # The computed hash value of this virtual node in the hash ring
-    hash_value: int
-    
-    # Optional weight for this virtual node (can be used for weighted distribution)
-    weight: int = 1
+    def __init__(
+        self,
+        physical_node: str,
+        id: int,
+        hash_value: int,
+        weight: int = 1,
+        metadata: Optional[dict] = None
+    ):
+        """
+        Initialize a new VirtualNode instance.
+        
+        Args:
+            physical_node: The name/ID of the physical node this virtual node represents.
+            id: A unique identifier for this virtual node.
+            hash_value: The computed hash value of this virtual node in the hash ring.
+            weight: Optional weight for this virtual node (can be used for weighted distribution).
+            metadata: Optional metadata that can be associated with the node.
+        """
+        self.physical_node = physical_node
+        self.id = id
+        self.hash_value = hash_value
+        self.weight = weight
+        self.metadata = metadata
     
-    # Optional metadata that can be associated with the node
-    metadata: Optional[dict] = None
+    def __repr__(self) -> str:
+        """Developer representation of a virtual node."""
+        return (
+            f"VirtualNode(physical_node={self.physical_node!r}, id={self.id!r}, "
+            f"hash_value={self.hash_value!r}, weight={self.weight!r}, metadata={self.metadata!r})"
+        )
     
     def __str__(self) -> str:
         """String representation of a virtual node."""
@@ -92,13 +132,8 @@ class VirtualNodeManager:
             self.physical_to_virtual[physical_node] = []
         
         # Create the specified number of virtual nodes
-        for i in range(count):
-            # Create a unique string for this virtual node
-            virtual_node_str = f"{physical_node}:{i}"
-            
-            # Compute the hash value for this virtual node
-            hash_value = self.hash_func(virtual_node_str)
-            
+        hash_values = virtual_node_hashes(self.hash_func, physical_node, count)
+        for i, hash_value in enumerate(hash_values):
             # Create the virtual node object
             v_node = VirtualNode(
                 physical_node=physical_node,
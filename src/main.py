@@ -13,12 +13,19 @@ import signal
 import sys
 import time
 from pathlib import Path
+from typing import List, Optional
+try:
+    import orjson  # Fast C JSON parser
+except ImportError:
+    # Make orjson optional since it requires installation
+    orjson = None
 
 from .core.load_balancer import LoadBalancer, Server
 from .core.consistent_hash import ConsistentHash
 from .utils.hashing import get_hash_function
 from .utils.health_check import HealthChecker
 from .api.server import APIServer
+from .api.routes import SERVER_NAME_RE
 
 
 # Set up logging
@@ -33,6 +40,8 @@ def load_config(config_path: str) -> dict:
     """
     Load configuration from a JSON file.
     
+    Uses orjson when it is installed and falls back to the standard library.
+    
     Args:
         config_path: Path to the configuration file.
         
@@ -40,14 +49,19 @@ def load_config(config_path: str) -> dict:
         The configuration dictionary.
     """
     try:
-        with open(config_path, 'r') as f:
-            config = json.load(f)
+        if orjson is not None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            with open(config_path, 'rb') as f:
+                config = orjson.loads(f.read())
+        else:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
         return config
     except FileNotFoundError:
-        logger.error(f"Configuration file not found: {config_path}")
+        logger.error("Configuration file not found: %s", config_path)
         sys.exit(1)
     except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in configuration file: {e}")
+        logger.error("Invalid JSON in configuration file: %s", e)
         sys.exit(1)
 
 
@@ -63,7 +77,8 @@ def create_default_config(config_path: str):
         "api": {
             "host": "0.0.0.0",
             "port": 8080,
-            "debug": False
+            "debug": False,
+            "threads": 8
         },
         "health_check": {
             "interval": 10.0,
@@ -96,7 +111,7 @@ def create_default_config(config_path: str):
     with open(config_path, 'w') as f:
         json.dump(default_config, f, indent=2)
     
-    logger.info(f"Created default configuration file: {config_path}")
+    logger.info("Created default configuration file: %s", config_path)
 
 
 def setup_load_balancer(config: dict) -> LoadBalancer:
@@ -112,9 +127,9 @@ def setup_load_balancer(config: dict) -> LoadBalancer:
     # Get the hash function
     hash_func_name = config.get("hash_function", "fnv1a")
     try:
-        hash_func = get_hash_function(hash_func_name)
+        hash_func = get_hash_function(hash_func_name, cache=config.get("hash_cache", True))
     except ValueError as e:
-        logger.error(f"Invalid hash function: {e}")
+        logger.error("Invalid hash function: %s", e)
         sys.exit(1)
     
     # Create the load balancer
@@ -122,15 +137,27 @@ def setup_load_balancer(config: dict) -> LoadBalancer:
     
     # Add servers from configuration
     servers_config = config.get("servers", [])
+    servers = []
     for server_config in servers_config:
-        server = Server(
-            name=server_config["name"],
+        name = server_config["name"]
+        if not isinstance(name, str) or not SERVER_NAME_RE.fullmatch(name):
+            # The API routes could never inspect, mark or remove such a server
+            logger.error("Skipped server with invalid name in configuration: %r", name)
+            continue
+        servers.append(Server(
+            name=name,
             address=server_config["address"],
             port=server_config["port"],
             weight=server_config.get("weight", 1)
-        )
-        load_balancer.add_server(server)
-        logger.info(f"Added server: {server}")
+        ))
+    
+    # Build the hash ring once for all configured servers
+    result = load_balancer.bulk_mutate(add=servers)
+    for server_name in result["skipped"]:
+        logger.warning("Skipped duplicate server in configuration: %s", server_name)
+    for server in servers:
+        if load_balancer.get_server_by_name(server.name) is server:
+            logger.info("Added server: %s", server)
     
     return load_balancer
 
@@ -152,7 +179,8 @@ def setup_health_checker(config: dict, load_balancer: LoadBalancer) -> HealthChe
         check_interval=health_config.get("interval", 10.0),
         timeout=health_config.get("timeout", 2.0),
         healthy_threshold=health_config.get("healthy_threshold", 2),
-        unhealthy_threshold=health_config.get("unhealthy_threshold", 3)
+        unhealthy_threshold=health_config.get("unhealthy_threshold", 3),
+        max_concurrent_checks=health_config.get("max_concurrent_checks", 32)
     )
     
     # Add all servers to the health checker
@@ -175,8 +203,13 @@ def signal_handler(signum, frame):
     sys.exit(0)
 
 
-def main():
-    """Main entry point for the load balancer application."""
+def main(argv: Optional[List[str]] = None):
+    """
+    Main entry point for the load balancer application.
+    
+    Args:
+        argv: The command-line arguments, defaulting to sys.argv[1:].
+    """
     parser = argparse.ArgumentParser(description="Load Balancer with Consistent Hashing")
     parser.add_argument(
         "--config",
@@ -206,7 +239,7 @@ def main():
         help="Enable debug mode"
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Create default config if requested
     if args.create_config:
@@ -247,16 +280,20 @@ def main():
             health_checker=health_checker,
             host=api_config.get("host", "0.0.0.0"),
             port=api_config.get("port", 8080),
-            debug=api_config.get("debug", False)
+            debug=api_config.get("debug", False),
+            threads=api_config.get("threads", 8)
         )
         
         # Start the API server
         logger.info("Starting load balancer...")
-        logger.info(f"API server will be available at http://{api_config.get('host', '0.0.0.0')}:{api_config.get('port', 8080)}")
+        logger.info(
+            "API server will be available at http://%s:%s",
+            api_config.get('host', '0.0.0.0'), api_config.get('port', 8080)
+        )
         
         # Show current server status
         stats = load_balancer.get_stats()
-        logger.info(f"Load balancer statistics: {stats}")
+        logger.info("Load balancer statistics: %s", stats)
         
         # Start the server (this will block)
         api_server.run()
@@ -264,7 +301,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt, shutting down...")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         sys.exit(1)
     finally:
         # Cleanup
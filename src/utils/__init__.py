@@ -12,6 +12,7 @@ from .hashing import (
     sha1_hash,
     crc32_hash,
     jump_hash,
+    power_consistent_hash,
     get_hash_function
 )
 
@@ -31,6 +32,7 @@ __all__ = [
     'sha1_hash',
     'crc32_hash',
     'jump_hash',
+    'power_consistent_hash',
     'get_hash_function',
     
     # Health check utilities
@@ -6,13 +6,30 @@ Different hashing strategies have different properties in terms of distribution
 """
 
 import hashlib
+import os
 import zlib
 import struct
+from functools import lru_cache
+from typing import List
 try:
     import mmh3  # MurmurHash implementation
 except ImportError:
     # Make mmh3 optional since it requires installation
     mmh3 = None
+try:
+    import xxhash  # xxHash implementation
+except ImportError:
+    # Make xxhash optional since it requires installation
+    xxhash = None
+
+# Reads the first 4 bytes of a digest as an unsigned int
+_unpack_uint32 = struct.Struct("I").unpack_from
+
+# Number of key hashes remembered by the functions from get_hash_function
+HASH_CACHE_SIZE = 65536
+
+# Longest key FNV-1a hashes without reducing the state after every byte
+FNV_UNMASKED_MAX_LENGTH = 40
 
 
 def simple_hash(key: str) -> int:
@@ -27,10 +44,8 @@ def simple_hash(key: str) -> int:
     Returns:
         A non-negative integer hash value.
     """
-    hash_val = 0
-    for char in key:
-        hash_val += ord(char)
-    return hash_val
+    # ASCII bytes equal the character ordinals, so sum() can add them in C
+    return sum(key.encode('ascii')) if key.isascii() else sum(map(ord, key))
 
 
 def djb2_hash(key: str) -> int:
@@ -44,11 +59,39 @@ def djb2_hash(key: str) -> int:
         A non-negative integer hash value.
     """
     hash_val = 5381
-    for char in key:
-        hash_val = ((hash_val << 5) + hash_val) + ord(char)  # hash * 33 + c
+    for code in key.encode('ascii') if key.isascii() else map(ord, key):
+        hash_val = hash_val * 33 + code
     return hash_val & 0xFFFFFFFF  # Ensure it's a 32-bit unsigned int
 
 
+def djb2_hash_batch(keys: List[str]) -> List[int]:
+    """
+    Hash many keys with DJB2, giving the same values as djb2_hash.
+    
+    The hash state after the keys' common prefix is computed once, so keys that
+    only differ in a short suffix, like the virtual nodes of a server, cost
+    little more than hashing their suffixes.
+    
+    Args:
+        keys: The strings to hash.
+        
+    Returns:
+        The hash values of the keys, in order.
+    """
+    prefix = os.path.commonprefix(keys)
+    start = len(prefix)
+    prefix_hash = djb2_hash(prefix)
+    
+    hashes = []
+    for key in keys:
+        hash_val = prefix_hash
+        suffix = key[start:]
+        for code in suffix.encode('ascii') if suffix.isascii() else map(ord, suffix):
+            hash_val = hash_val * 33 + code
+        hashes.append(hash_val & 0xFFFFFFFF)
+    return hashes
+
+
 def fnv1a_hash(key: str) -> int:
     """
     FNV-1a hash function, which has good distribution and performance.
@@ -63,13 +106,63 @@ def fnv1a_hash(key: str) -> int:
     FNV_OFFSET_BASIS = 2166136261
     
     hash_val = FNV_OFFSET_BASIS
-    for char in key:
-        hash_val = hash_val ^ ord(char)
-        hash_val = (hash_val * FNV_PRIME) & 0xFFFFFFFF
+    # ASCII bytes equal the character ordinals, and iterating them avoids an ord() call per character
+    codes = key.encode('ascii') if key.isascii() else map(ord, key)
+    
+    if len(key) <= FNV_UNMASKED_MAX_LENGTH:
+        # The XOR only changes the low bits, so reducing once at the end gives
+        # the same value; for short keys the state stays small enough that
+        # this is faster than masking every byte
+        for code in codes:
+            hash_val = (hash_val ^ code) * FNV_PRIME
+        return hash_val & 0xFFFFFFFF
+    
+    for code in codes:
+        hash_val = ((hash_val ^ code) * FNV_PRIME) & 0xFFFFFFFF
     
     return hash_val
 
 
+def fnv1a_hash_batch(keys: List[str]) -> List[int]:
+    """
+    Hash many keys with FNV-1a, giving the same values as fnv1a_hash.
+    
+    The hash state after the keys' common prefix is computed once, so keys that
+    only differ in a short suffix, like the virtual nodes of a server, cost
+    little more than hashing their suffixes.
+    
+    Args:
+        keys: The strings to hash.
+        
+    Returns:
+        The hash values of the keys, in order.
+    """
+    FNV_PRIME = 16777619
+    
+    prefix = os.path.commonprefix(keys)
+    start = len(prefix)
+    prefix_hash = fnv1a_hash(prefix)
+    
+    hashes = []
+    for key in keys:
+        hash_val = prefix_hash
+        suffix = key[start:]
+        codes = suffix.encode('ascii') if suffix.isascii() else map(ord, suffix)
+        if len(suffix) <= FNV_UNMASKED_MAX_LENGTH:
+            for code in codes:
+                hash_val = (hash_val ^ code) * FNV_PRIME
+        else:
+            for code in codes:
+                hash_val = ((hash_val ^ code) * FNV_PRIME) & 0xFFFFFFFF
+        hashes.append(hash_val & 0xFFFFFFFF)
+    return hashes
+
+
+# Batch variants hash many keys at once, e.g. all virtual nodes of a server
+djb2_hash.batch = djb2_hash_batch
+fnv1a_hash.batch = fnv1a_hash_batch
+
+
 def md5_hash(key: str) -> int:
     """
     MD5-based hash function, which provides good distribution but is slower.
@@ -80,10 +173,11 @@ def md5_hash(key: str) -> int:
     Returns:
         A non-negative integer hash value based on the first 4 bytes of the MD5 hash.
     """
-    md5 = hashlib.md5()
-    md5.update(key.encode('utf-8'))
+    # One-shot constructor; these hashes are not used for security, which
+    # also keeps MD5 available on FIPS-enabled OpenSSL builds
+    digest = hashlib.md5(key.encode('utf-8'), usedforsecurity=False).digest()
     # Take first 4 bytes and convert to int
-    return struct.unpack("I", md5.digest()[:4])[0]
+    return _unpack_uint32(digest)[0]
 
 
 def sha1_hash(key: str) -> int:
@@ -96,10 +190,9 @@ def sha1_hash(key: str) -> int:
     Returns:
         A non-negative integer hash value based on the first 4 bytes of the SHA1 hash.
     """
-    sha1 = hashlib.sha1()
-    sha1.update(key.encode('utf-8'))
+    digest = hashlib.sha1(key.encode('utf-8'), usedforsecurity=False).digest()
     # Take first 4 bytes and convert to int
-    return struct.unpack("I", sha1.digest()[:4])[0]
+    return _unpack_uint32(digest)[0]
 
 
 def crc32_hash(key: str) -> int:
@@ -112,7 +205,9 @@ def crc32_hash(key: str) -> int:
     Returns:
         A non-negative integer hash value.
     """
-    return zlib.crc32(key.encode('utf-8')) & 0xFFFFFFFF
+    # zlib.crc32 already returns an unsigned 32-bit value in Python 3, and
+    # encode() defaults to UTF-8 without parsing an argument
+    return zlib.crc32(key.encode())
 
 
 def murmur3_hash(key: str) -> int:
@@ -132,6 +227,22 @@ def murmur3_hash(key: str) -> int:
     return mmh3.hash(key, seed=0) & 0xFFFFFFFF
 
 
+def xxhash_hash(key: str) -> int:
+    """
+    XXH3 hash function, implemented in C and much faster than the pure Python
+    functions in this module. Recommended when the xxhash package is installed.
+    
+    Args:
+        key: The string to hash.
+        
+    Returns:
+        A non-negative 64-bit integer hash value.
+    """
+    if xxhash is None:
+        raise ImportError("xxhash module not found. Install with 'pip install xxhash'")
+    return xxhash.xxh3_64_intdigest(key)
+
+
 def jump_hash(key: str, bucket_count: int) -> int:
     """
     Jump Consistent Hash, a fast, minimal memory, consistent hashing algorithm.
@@ -159,17 +270,129 @@ def jump_hash(key: str, bucket_count: int) -> int:
     while j < bucket_count:
         b = j
         key_hash = ((key_hash * 2862933555777941757) + 1) & 0xFFFFFFFFFFFFFFFF
-        j = int(float(b + 1) * (float(1 << 31) / float((key_hash >> 33) + 1)))
+        # True division already yields a float; the explicit float() calls
+        # only added a builtin call per conversion
+        j = int((b + 1) * ((1 << 31) / ((key_hash >> 33) + 1)))
     
     return b
 
 
-def get_hash_function(name: str):
+def _mix64(value: int) -> int:
+    """
+    SplitMix64 finalizer, turning an integer into 64 well-mixed random bits.
+    
+    Args:
+        value: A non-negative integer.
+        
+    Returns:
+        A 64-bit integer.
+    """
+    value = (value + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
+
+
+def _power_f(key_bits: int, mask: int) -> int:
+    """
+    Map a key to [0, mask] consistently across power-of-two bucket counts.
+    
+    The highest set bit of the key under the mask picks the range [2^j, 2^(j+1)),
+    and a per-bit random value picks the bucket within it. Growing the mask only
+    moves keys into the new upper half.
+    """
+    masked = key_bits & mask
+    if not masked:
+        return 0
+    j = masked.bit_length() - 1
+    low = 1 << j
+    return low + (_mix64(key_bits + j) & (low - 1))
+
+
+def _power_g(key_bits: int, bucket_count: int, start: int) -> int:
+    """
+    Follow the key's jump chain from start and return its last bucket below bucket_count.
+    
+    Each step jumps from x to floor((x + 1) / u) for a uniform u in (0, 1] drawn
+    from the key and x, as in jump hash.
+    """
+    x = start
+    while True:
+        u = ((_mix64(key_bits ^ (x << 1 | 1)) >> 11) + 1) / 9007199254740992.0
+        next_x = int((x + 1) / u)
+        if next_x >= bucket_count:
+            return x
+        x = next_x
+
+
+def power_consistent_hash(key: str, bucket_count: int) -> int:
+    """
+    Power Consistent Hash, a consistent hash with O(1) expected lookup time.
+    
+    Like jump_hash it maps keys directly to buckets, and growing the bucket count
+    by one only moves keys into the new bucket, but its cost does not grow with
+    the bucket count (Eric Leu, "Fast Consistent Hashing in Constant Time").
+    It is faster than jump_hash from roughly a hundred buckets up.
+    
+    Args:
+        key: The string to hash.
+        bucket_count: The number of buckets.
+        
+    Returns:
+        A bucket number in the range [0, bucket_count-1].
+    """
+    if bucket_count <= 0:
+        raise ValueError("Bucket count must be positive")
+    if bucket_count == 1:
+        return 0
+    
+    key_bits = _mix64(fnv1a_hash(key))
+    
+    # Smallest power of two >= bucket_count
+    size = 1 << (bucket_count - 1).bit_length()
+    bucket = _power_f(key_bits, size - 1)
+    if bucket < bucket_count:
+        return bucket
+    
+    # The key fell past the last bucket: move it along its jump chain from the
+    # lower half, or back into the lower half when the chain ends there
+    half = size >> 1
+    bucket = _power_g(key_bits, bucket_count, half - 1)
+    if bucket >= half:
+        return bucket
+    return _power_f(key_bits, half - 1)
+
+
+# Hash functions available by name, built once at import
+HASH_FUNCTIONS = {
+    'simple': simple_hash,
+    'djb2': djb2_hash,
+    'fnv1a': fnv1a_hash,
+    'md5': md5_hash,
+    'sha1': sha1_hash,
+    'crc32': crc32_hash,
+}
+
+# Add murmur3 if available
+if mmh3 is not None:
+    HASH_FUNCTIONS['murmur3'] = murmur3_hash
+
+# Add xxhash if available
+if xxhash is not None:
+    HASH_FUNCTIONS['xxhash'] = xxhash_hash
+
+
+def get_hash_function(name: str, cache: bool = True):
     """
     Get a hash function by name.
     
+    The function is wrapped in an LRU cache by default, so keys that are looked
+    up again, for example after a server change invalidates the load balancer's
+    lookup cache, are not re-hashed. Pass cache=False when keys rarely repeat.
+    
     Args:
         name: The name of the hash function to get.
+        cache: Whether to cache the hash values of the most recent keys.
         
     Returns:
         A function that takes a string and returns an integer hash value.
@@ -177,20 +400,11 @@ def get_hash_function(name: str):
     Raises:
         ValueError: If the hash function is not found.
     """
-    hash_functions = {
-        'simple': simple_hash,
-        'djb2': djb2_hash,
-        'fnv1a': fnv1a_hash,
-        'md5': md5_hash,
-        'sha1': sha1_hash,
-        'crc32': crc32_hash,
-    }
-    
-    # Add murmur3 if available
-    if mmh3 is not None:
-        hash_functions['murmur3'] = murmur3_hash
-    
-    if name not in hash_functions:
-        raise ValueError(f"Hash function '{name}' not found. Available functions: {list(hash_functions.keys())}")
+    hash_func = HASH_FUNCTIONS.get(name)
+    if hash_func is None:
+        raise ValueError(f"Hash function '{name}' not found. Available functions: {list(HASH_FUNCTIONS.keys())}")
     
-    return hash_functions[name]
\ No newline at end of file
+    if cache:
+        # lru_cache copies a batch variant over with the function's attributes
+        hash_func = lru_cache(maxsize=HASH_CACHE_SIZE)(hash_func)
+    return hash_func
\ No newline at end of file
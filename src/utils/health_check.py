@@ -4,23 +4,42 @@ Health Check Utilities
 This module provides functions to check the health of servers in the load balancing pool.
 """
 
+import errno
+import os
+import selectors
 import time
 import logging
 import socket
 import threading
-from typing import Dict, List, Optional, Callable, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Callable, Any, Tuple
 import http.client
 from urllib.parse import urlparse
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# connect_ex() results meaning a non-blocking connect is still in progress
+CONNECT_IN_PROGRESS = frozenset({
+    errno.EINPROGRESS,
+    errno.EWOULDBLOCK,
+    getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK),
+})
+
+# Where supported (Linux), sockets are created non-blocking by the socket()
+# call itself, saving a syscall per check
+SOCK_NONBLOCK = getattr(socket, "SOCK_NONBLOCK", 0)
+
 
 class HealthCheckResult:
     """
     Represents the result of a health check.
     """
     
+    # Slots keep the result created per server per check small
+    __slots__ = ('is_healthy', 'response_time', 'status_code', 'error_message', 'timestamp')
+    
     def __init__(
         self,
         is_healthy: bool,
@@ -68,6 +87,7 @@ class HealthChecker:
         timeout: float = 2.0,
         healthy_threshold: int = 2,
         unhealthy_threshold: int = 3,
+        max_concurrent_checks: int = 32,
     ):
         """
         Initialize a new HealthChecker instance.
@@ -77,17 +97,23 @@ class HealthChecker:
             timeout: The timeout (in seconds) for health checks.
             healthy_threshold: The number of consecutive successful checks required to mark a server as healthy.
             unhealthy_threshold: The number of consecutive failed checks required to mark a server as unhealthy.
+            max_concurrent_checks: The maximum number of servers probed in parallel.
         """
         self.check_interval = check_interval
         self.timeout = timeout
         self.healthy_threshold = healthy_threshold
         self.unhealthy_threshold = unhealthy_threshold
+        self.max_concurrent_checks = max_concurrent_checks
         
         self._servers = {}  # server_id -> server_info
         self._check_counters = {}  # server_id -> (healthy_count, unhealthy_count)
         self._last_results = {}  # server_id -> HealthCheckResult
+        self._http_connections = {}  # server_id -> idle keep-alive HTTPConnection
+        self._servers_version = 0  # Bumped when servers are added or removed
+        self._targets = (-1, [], [])  # (servers_version, tcp_targets, probe_items)
         self._check_thread = None
         self._stop_event = threading.Event()
+        self.version = 0  # Bumped whenever monitored servers or results change
     
     def add_server(
         self,
@@ -114,6 +140,9 @@ class HealthChecker:
             "expected_status": expected_status,
         }
         self._check_counters[server_id] = (0, 0)  # (healthy_count, unhealthy_count)
+        self._close_http_connection(server_id)  # The address may have changed
+        self._servers_version += 1
+        self.version += 1
     
     def remove_server(self, server_id: str):
         """
@@ -126,6 +155,9 @@ class HealthChecker:
             self._servers.pop(server_id)
             self._check_counters.pop(server_id, None)
             self._last_results.pop(server_id, None)
+            self._close_http_connection(server_id)
+            self._servers_version += 1
+            self.version += 1
     
     def start(self):
         """Start the health checking thread."""
@@ -144,37 +176,154 @@ class HealthChecker:
             self._stop_event.set()
             self._check_thread.join(timeout=5.0)
             logger.info("Health checker stopped.")
+        
+        for server_id in list(self._http_connections):
+            self._close_http_connection(server_id)
+    
+    def _close_http_connection(self, server_id: str):
+        """
+        Close and forget a server's idle keep-alive connection, if any.
+        
+        Args:
+            server_id: The server's unique identifier.
+        """
+        conn = self._http_connections.pop(server_id, None)
+        if conn is not None:
+            conn.close()
     
     def _check_loop(self):
-        """Main health checking loop."""
-        while not self._stop_event.is_set():
-            for server_id, server_config in list(self._servers.items()):
+        """
+        Main health checking loop.
+        
+        Each round probes all servers in parallel, TCP checks as one
+        non-blocking batch in this thread and the others on a thread pool, so
+        a round takes about as long as the slowest probe rather than the sum
+        of them. Results are then applied in this thread. Rounds start every
+        check_interval seconds, however long each one takes.
+        """
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_checks,
+            thread_name_prefix="health-check"
+        ) as executor:
+            next_check = time.monotonic()
+            while not self._stop_event.is_set():
                 try:
-                    result = self._check_server(server_id, server_config)
-                    self._last_results[server_id] = result
-                    
-                    # Update counters
-                    healthy_count, unhealthy_count = self._check_counters[server_id]
-                    if result.is_healthy:
-                        healthy_count += 1
-                        unhealthy_count = 0
-                    else:
-                        unhealthy_count += 1
-                        healthy_count = 0
-                    
-                    self._check_counters[server_id] = (healthy_count, unhealthy_count)
-                    
-                    # Notify listeners if state has changed
-                    if healthy_count >= self.healthy_threshold:
-                        self._on_server_healthy(server_id)
-                    elif unhealthy_count >= self.unhealthy_threshold:
-                        self._on_server_unhealthy(server_id)
+                    self._check_all(executor)
+                except Exception:
+                    # Keep monitoring; the next round may well succeed
+                    logger.exception("Health check round failed")
+                
+                # Wait for next check interval, counted from the start of this
+                # round so the time spent checking does not delay the next one
+                next_check += self.check_interval
+                delay = next_check - time.monotonic()
+                if delay < 0:
+                    # The round overran the interval; start the next one now
+                    # instead of running a burst of rounds to catch up
+                    next_check -= delay
+                    delay = 0
+                self._stop_event.wait(delay)
+    
+    def _probe(self, item: Tuple[str, Dict[str, Any]]) -> Tuple[str, Optional[HealthCheckResult]]:
+        """
+        Check one server, returning None instead of raising on unexpected errors.
+        
+        Args:
+            item: A (server_id, server_config) pair.
+            
+        Returns:
+            A (server_id, result) pair.
+        """
+        server_id, server_config = item
+        try:
+            return server_id, self._check_server(server_id, server_config)
+        except Exception as e:
+            logger.error("Error checking server %s: %s", server_id, e)
+            return server_id, None
+    
+    def _check_all(self, executor: ThreadPoolExecutor):
+        """
+        Probe every monitored server once and update the counters.
+        
+        Args:
+            executor: The thread pool that runs the probes.
+        """
+        tcp_targets, probe_items = self._get_targets()
+        
+        # The pool starts on the other probes while the TCP batch waits
+        probes = executor.map(self._probe, probe_items)
+        results = list(self._tcp_check_batch(tcp_targets).items()) if tcp_targets else []
+        results.extend(probes)
+        
+        # Bound once per round rather than looked up per server
+        servers = self._servers
+        last_results = self._last_results
+        counters = self._check_counters
+        healthy_threshold = self.healthy_threshold
+        unhealthy_threshold = self.unhealthy_threshold
+        
+        applied = False
+        for server_id, result in results:
+            if result is None or server_id not in servers:
+                # Failed unexpectedly, or removed while it was being checked
+                continue
+            
+            try:
+                last_results[server_id] = result
+                applied = True
+                
+                # Update counters
+                healthy_count, unhealthy_count = counters[server_id]
+                if result.is_healthy:
+                    healthy_count += 1
+                    unhealthy_count = 0
+                else:
+                    unhealthy_count += 1
+                    healthy_count = 0
+                
+                counters[server_id] = (healthy_count, unhealthy_count)
                 
-                except Exception as e:
-                    logger.error(f"Error checking server {server_id}: {e}")
+                # Notify listeners if state has changed
+                if healthy_count >= healthy_threshold:
+                    self._on_server_healthy(server_id)
+                elif unhealthy_count >= unhealthy_threshold:
+                    self._on_server_unhealthy(server_id)
             
-            # Wait for next check interval
-            self._stop_event.wait(self.check_interval)
+            except Exception as e:
+                logger.error("Error checking server %s: %s", server_id, e)
+        
+        if applied:
+            # One bump per round is enough for readers comparing versions
+            self.version += 1
+    
+    def _get_targets(self) -> Tuple[List[Tuple[str, str, int]], List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Get the servers to check, split into TCP targets and other probes.
+        
+        The split is rebuilt only after servers are added or removed, so a round
+        does not look up every server's check type and address again.
+        
+        Returns:
+            A list of (server_id, address, port) tuples for TCP checks, and a
+            list of (server_id, server_config) pairs for the other checks.
+        """
+        built_version, tcp_targets, probe_items = self._targets
+        # Read before building, so a change made meanwhile triggers a rebuild
+        servers_version = self._servers_version
+        if built_version == servers_version:
+            return tcp_targets, probe_items
+        
+        tcp_targets = []
+        probe_items = []
+        for server_id, server_config in list(self._servers.items()):
+            if server_config["check_type"] == "tcp":
+                server_info = server_config["info"]
+                tcp_targets.append((server_id, server_info["address"], server_info["port"]))
+            else:
+                probe_items.append((server_id, server_config))
+        
+        self._targets = (servers_version, tcp_targets, probe_items)
+        return tcp_targets, probe_items
     
     def _check_server(self, server_id: str, server_config: Dict[str, Any]) -> HealthCheckResult:
         """
@@ -200,7 +349,7 @@ class HealthChecker:
                 server_config["expected_status"],
             )
         elif check_type == "tcp":
-            return self._tcp_check(server_id, server_info["address"], server_info["port"])
+            return self._tcp_check_batch([(server_id, server_info["address"], server_info["port"])])[server_id]
         else:
             return HealthCheckResult(False, error_message=f"Unknown check type: {check_type}")
     
@@ -229,16 +378,34 @@ class HealthChecker:
         """
         start_time = time.time()
         
+        # Reuse the connection kept from the last check; while it is in use it
+        # is out of the pool, so no other check can share it
+        conn = self._http_connections.pop(server_id, None)
+        reused = conn is not None
+        
         try:
-            if use_ssl:
-                conn = http.client.HTTPSConnection(address, port, timeout=self.timeout)
-            else:
-                conn = http.client.HTTPConnection(address, port, timeout=self.timeout)
+            try:
+                if conn is None:
+                    conn = self._new_http_connection(address, port, use_ssl)
+                conn.request("GET", endpoint)
+                response = conn.getresponse()
+            except (ConnectionResetError, BrokenPipeError):
+                if not reused:
+                    raise
+                # The server closed the idle connection; retry on a new one
+                conn.close()
+                conn = self._new_http_connection(address, port, use_ssl)
+                conn.request("GET", endpoint)
+                response = conn.getresponse()
             
-            conn.request("GET", endpoint)
-            response = conn.getresponse()
+            # Read the body so the connection is ready for the next check
+            response.read()
             response_time = time.time() - start_time
             
+            if not response.will_close and server_id in self._servers:
+                self._http_connections[server_id] = conn
+                conn = None
+            
             status_code = response.status
             is_healthy = status_code == expected_status
             
@@ -257,35 +424,110 @@ class HealthChecker:
             return HealthCheckResult(False, response_time, error_message=str(e))
         
         finally:
-            conn.close()
+            if conn is not None:
+                conn.close()
     
-    def _tcp_check(self, server_id: str, address: str, port: int) -> HealthCheckResult:
+    def _new_http_connection(self, address: str, port: int, use_ssl: bool) -> http.client.HTTPConnection:
         """
-        Perform a TCP health check.
+        Open an HTTP(S) connection for health checks.
         
         Args:
-            server_id: The server's unique identifier.
             address: The server's address.
             port: The server's port.
+            use_ssl: Whether to use HTTPS.
             
         Returns:
-            A HealthCheckResult object.
+            An HTTPConnection or HTTPSConnection.
+        """
+        if use_ssl:
+            return http.client.HTTPSConnection(address, port, timeout=self.timeout)
+        return http.client.HTTPConnection(address, port, timeout=self.timeout)
+    
+    def _tcp_check_batch(self, targets: List[Tuple[str, str, int]]) -> Dict[str, HealthCheckResult]:
+        """
+        Perform TCP health checks on several servers at once.
+        
+        All connects are started non-blocking and waited on together with a
+        selector, so the batch takes at most one timeout however many servers
+        it checks.
+        
+        Args:
+            targets: (server_id, address, port) tuples.
+            
+        Returns:
+            A dictionary mapping each server_id to its HealthCheckResult.
         """
+        results = {}
         start_time = time.time()
         
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(self.timeout)
-            sock.connect((address, port))
-            response_time = time.time() - start_time
-            return HealthCheckResult(True, response_time)
+        with selectors.DefaultSelector() as selector:
+            try:
+                for server_id, address, port in targets:
+                    try:
+                        # Creating the socket can fail too, e.g. out of file descriptors
+                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM | SOCK_NONBLOCK)
+                    except Exception as e:
+                        results[server_id] = HealthCheckResult(False, time.time() - start_time, error_message=str(e))
+                        continue
+                    
+                    try:
+                        if not SOCK_NONBLOCK:
+                            sock.setblocking(False)
+                        error = sock.connect_ex((address, port))
+                        if error in CONNECT_IN_PROGRESS:
+                            selector.register(sock, selectors.EVENT_WRITE, server_id)
+                            continue
+                    except Exception as e:
+                        sock.close()
+                        results[server_id] = HealthCheckResult(False, time.time() - start_time, error_message=str(e))
+                        continue
+                    
+                    sock.close()
+                    results[server_id] = self._connect_result(error, start_time)
+                
+                # A socket turns writable once its connect has succeeded or failed
+                deadline = start_time + self.timeout
+                while selector.get_map():
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    for key, _ in selector.select(remaining):
+                        sock = key.fileobj
+                        selector.unregister(sock)
+                        try:
+                            error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                        finally:
+                            sock.close()
+                        results[key.data] = self._connect_result(error, start_time)
+                
+                # Whatever is still registered did not connect in time
+                for key in selector.get_map().values():
+                    results[key.data] = HealthCheckResult(False, time.time() - start_time, error_message="timed out")
+            
+            finally:
+                # Close the sockets still registered, also when the batch fails part way
+                for key in list(selector.get_map().values()):
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
         
-        except Exception as e:
-            response_time = time.time() - start_time
-            return HealthCheckResult(False, response_time, error_message=str(e))
+        return results
+    
+    @staticmethod
+    def _connect_result(error: int, start_time: float) -> HealthCheckResult:
+        """
+        Turn the outcome of a non-blocking connect into a HealthCheckResult.
         
-        finally:
-            sock.close()
+        Args:
+            error: The connect's errno, 0 on success.
+            start_time: When the connect was started.
+            
+        Returns:
+            A HealthCheckResult object.
+        """
+        response_time = time.time() - start_time
+        if error == 0:
+            return HealthCheckResult(True, response_time)
+        return HealthCheckResult(False, response_time, error_message=os.strerror(error))
     
     def _on_server_healthy(self, server_id: str):
         """
@@ -296,7 +538,7 @@ class HealthChecker:
         """
         # This is a placeholder that can be overridden by subclasses
         # or replaced with a callback mechanism
-        logger.info(f"Server {server_id} is now healthy")
+        logger.info("Server %s is now healthy", server_id)
     
     def _on_server_unhealthy(self, server_id: str):
         """
@@ -307,7 +549,33 @@ class HealthChecker:
         """
         # This is a placeholder that can be overridden by subclasses
         # or replaced with a callback mechanism
-        logger.warning(f"Server {server_id} is now unhealthy")
+        logger.warning("Server %s is now unhealthy", server_id)
+    
+    def get_summary(self, server_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a compact health summary for a single server.
+        
+        Cheaper than get_status() as it skips the server info and error dict.
+        
+        Args:
+            server_id: The server's unique identifier.
+            
+        Returns:
+            A dictionary with the last check time, response time and check counters,
+            or None if the server is not monitored.
+        """
+        if server_id not in self._servers:
+            return None
+        
+        result = self._last_results.get(server_id)
+        healthy_count, unhealthy_count = self._check_counters.get(server_id, (0, 0))
+        
+        return {
+            "last_check": result.timestamp if result else None,
+            "response_time": result.response_time if result else None,
+            "healthy_count": healthy_count,
+            "unhealthy_count": unhealthy_count,
+        }
     
     def get_status(self, server_id: str = None) -> Dict[str, Any]:
         """
@@ -357,14 +625,31 @@ def ping_server(address: str, port: int, timeout: float = 1.0) -> bool:
         True if the server is reachable, False otherwise.
     """
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect((address, port))
-        return True
+        # Resolves the address and connects in one call, closing the socket on failure
+        with socket.create_connection((address, port), timeout=timeout):
+            return True
     except Exception:
         return False
-    finally:
-        sock.close()
+
+
+@lru_cache(maxsize=1024)
+def _parse_check_url(url: str) -> Tuple[str, str, bool]:
+    """
+    Split a health check URL into what an HTTP connection needs.
+    
+    Cached, as the same URLs are checked every interval.
+    
+    Args:
+        url: The URL to check.
+        
+    Returns:
+        The netloc, the path including any query string, and whether to use HTTPS.
+    """
+    parsed_url = urlparse(url)
+    path = parsed_url.path or "/"
+    if parsed_url.query:
+        path += "?" + parsed_url.query
+    return parsed_url.netloc, path, parsed_url.scheme == "https"
 
 
 # HTTP health check function
@@ -389,17 +674,14 @@ def http_health_check(
         A HealthCheckResult object.
     """
     start_time = time.time()
+    conn = None
     
     try:
-        parsed_url = urlparse(url)
-        if parsed_url.scheme == "https":
-            conn = http.client.HTTPSConnection(parsed_url.netloc, timeout=timeout)
+        netloc, path, use_ssl = _parse_check_url(url)
+        if use_ssl:
+            conn = http.client.HTTPSConnection(netloc, timeout=timeout)
         else:
-            conn = http.client.HTTPConnection(parsed_url.netloc, timeout=timeout)
-        
-        path = parsed_url.path or "/"
-        if parsed_url.query:
-            path += "?" + parsed_url.query
+            conn = http.client.HTTPConnection(netloc, timeout=timeout)
         
         conn.request(method, path, headers=headers or {})
         response = conn.getresponse()
@@ -423,4 +705,5 @@ def http_health_check(
         return HealthCheckResult(False, response_time, error_message=str(e))
     
     finally:
-        conn.close()
\ No newline at end of file
+        if conn is not None:
+            conn.close()
\ No newline at end of file
@@ -9,6 +9,15 @@ import os
 import sys
 import subprocess
 import json
+import hashlib
+try:
+    import orjson  # Fast C JSON serializer
+except ImportError:
+    # Make orjson optional, since this script runs before dependencies are installed
+    orjson = None
+
+# Records the hash of the requirements file that was last installed
+DEPS_STAMP_FILE = ".deps.stamp"
 
 def check_python_version():
     """Check if Python version is adequate."""
@@ -17,14 +26,31 @@ def check_python_version():
         sys.exit(1)
 
 def install_dependencies():
-    """Install required dependencies."""
+    """Install required dependencies, unless requirements.txt is unchanged since the last install."""
+    with open("requirements.txt", "rb") as f:
+        requirements_hash = hashlib.sha256(f.read()).hexdigest()
+    try:
+        with open(DEPS_STAMP_FILE) as f:
+            if f.read().strip() == requirements_hash:
+                print("Dependencies up to date")
+                return
+    except OSError:
+        pass
+    
     print("Installing dependencies...")
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        subprocess.check_call([
+            sys.executable, "-m", "pip", "install",
+            "--disable-pip-version-check", "--no-input", "--prefer-binary",
+            "-r", "requirements.txt"
+        ])
         print("Dependencies installed successfully!")
     except subprocess.CalledProcessError:
         print("Error: Failed to install dependencies")
         sys.exit(1)
+    
+    with open(DEPS_STAMP_FILE, 'w') as f:
+        f.write(requirements_hash)
 
 def create_default_config():
     """Create default configuration if it doesn't exist."""
@@ -66,22 +92,26 @@ def create_default_config():
             ]
         }
         
-        with open(config_path, 'w') as f:
-            json.dump(default_config, f, indent=2)
+        # Keep the file indented, since it is meant to be edited by hand
+        if orjson is not None:
+            data = orjson.dumps(default_config, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(default_config, indent=2).encode('utf-8')
+        with open(config_path, 'wb') as f:
+            f.write(data)
         print(f"Created {config_path}")
 
 def start_load_balancer():
     """Start the load balancer."""
     print("Starting load balancer...")
     try:
-        # Change to src directory and run main.py
-        src_path = os.path.join(os.path.dirname(__file__), "src")
-        main_script = os.path.join(src_path, "main.py")
-        
-        env = os.environ.copy()
-        env["PYTHONPATH"] = src_path
+        # Run the load balancer in this process instead of starting another
+        # interpreter; the src package is found next to this script
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        from src.main import main as lb_main
         
-        subprocess.run([sys.executable, main_script], cwd=os.path.dirname(__file__), env=env)
+        # The quick start options are not load balancer options
+        lb_main([])
     except KeyboardInterrupt:
         print("\nShutting down load balancer...")
     except Exception as e:
@@ -2,4 +2,10 @@
 Test Suite for Load Balancer
 
 This package contains unit tests for all components of the load balancer.
-"""
\ No newline at end of file
+"""
+
+import os
+import sys
+
+# Add src directory to path so the test modules can import core and utils
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -1,9 +1,11 @@
 #!/usr/bin/env python3
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+# Also run as a script, where tests/__init__.py is not imported
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.consistent_hash import ConsistentHash
+from core.load_balancer import LoadBalancer, Server
 from utils.hashing import fnv1a_hash
 
 def test_basic_functionality():
@@ -38,11 +40,8 @@ def test_basic_functionality():
 def test_load_balancer():
     print("\nTesting LoadBalancer...")
     
-    from core.load_balancer import LoadBalancer, Server
-    from utils.hashing import get_hash_function
-      # Create load balancer
-    hash_func = get_hash_function('md5')
-    lb = LoadBalancer(hash_func)
+    # Create load balancer
+    lb = LoadBalancer(fnv1a_hash)
     
     # Add servers
     server1 = Server("server1", "localhost", 8001)
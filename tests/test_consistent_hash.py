@@ -2,16 +2,16 @@
 Unit tests for ConsistentHash implementation.
 """
 
+import bisect
+import copy
 import unittest
-import sys
-import os
-
-# Add src directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from core.consistent_hash import ConsistentHash
 from utils.hashing import fnv1a_hash, djb2_hash
 
+# Lookup keys shared by the tests, built once; tests slice off as many as they need
+KEYS = tuple(f"key_{i}" for i in range(100))
+
 
 class TestConsistentHash(unittest.TestCase):
     """Test cases for ConsistentHash class."""
@@ -81,6 +81,41 @@ class TestConsistentHash(unittest.TestCase):
         # Keys should now map to remaining node
         self.assertEqual(self.consistent_hash.get_node("test_key"), "node2")
 
+    def test_sorted_nodes_alignment(self):
+        """Test that sorted_nodes stays aligned with sorted_keys."""
+        self.consistent_hash.add_node("node1")
+        self.consistent_hash.add_node("node2", weight=2)
+        self.consistent_hash.add_node("node3")
+        self.consistent_hash.remove_node("node2")
+        
+        ring = self.consistent_hash.ring
+        self.assertEqual(self.consistent_hash.sorted_keys, sorted(ring))
+        self.assertEqual(
+            self.consistent_hash.sorted_nodes,
+            [ring[hash_value] for hash_value in self.consistent_hash.sorted_keys]
+        )
+
+    def test_update_nodes(self):
+        """Test adding and removing several nodes at once."""
+        self.consistent_hash.add_node("node1")
+        
+        self.consistent_hash.update_nodes(
+            add=[("node2", 1), ("node3", 2)],
+            remove=["node1", "nonexistent"]
+        )
+        
+        self.assertNotIn("node1", self.consistent_hash.nodes)
+        self.assertEqual(len(self.consistent_hash.nodes["node2"]), 100)
+        self.assertEqual(len(self.consistent_hash.nodes["node3"]), 200)
+        self.assertEqual(self.consistent_hash.sorted_keys, sorted(self.consistent_hash.ring))
+        
+        # Should map keys exactly like a ring built one node at a time
+        expected = ConsistentHash(self.hash_func)
+        expected.add_node("node2")
+        expected.add_node("node3", weight=2)
+        for key in KEYS[:50]:
+            self.assertEqual(self.consistent_hash.get_node(key), expected.get_node(key))
+    
     def test_remove_nonexistent_node(self):
         """Test removing a node that doesn't exist."""
         self.consistent_hash.add_node("node1")
@@ -91,13 +126,58 @@ class TestConsistentHash(unittest.TestCase):
         # Original node should still be there
         self.assertIn("node1", self.consistent_hash.nodes)
 
+    def test_iter_nodes_matches_ring_walk(self):
+        """Test that skipping runs yields the same order as walking every virtual node."""
+        for i in range(4):
+            self.consistent_hash.add_node(f"node{i}", weight=i + 1)
+        
+        sorted_keys = self.consistent_hash.sorted_keys
+        sorted_nodes = self.consistent_hash.sorted_nodes
+        for key in KEYS:
+            start = bisect.bisect_left(sorted_keys, self.hash_func(key)) % len(sorted_keys)
+            expected = []
+            for i in range(len(sorted_nodes)):
+                node = sorted_nodes[(start + i) % len(sorted_nodes)]
+                if node not in expected:
+                    expected.append(node)
+            
+            self.assertEqual(list(self.consistent_hash.iter_nodes(key)), expected)
+        
+        # A single node has no other node to skip to
+        single = ConsistentHash(self.hash_func)
+        single.add_node("only")
+        self.assertEqual(list(single.iter_nodes("key")), ["only"])
+    
+    def test_edge_cases(self):
+        """Test edge cases and error conditions."""
+        # Test with empty key
+        self.consistent_hash.add_node("node1")
+        self.assertEqual(self.consistent_hash.get_node(""), "node1")
+        
+        # Test with unicode key
+        self.assertEqual(self.consistent_hash.get_node("测试"), "node1")
+        
+        # Test get_nodes with zero count
+        self.assertEqual(self.consistent_hash.get_nodes("key", 0), [])
+        
+        # Test get_nodes with count larger than available nodes
+        result = self.consistent_hash.get_nodes("key", 10)
+        self.assertEqual(len(result), 1)  # Only one node available
+
+class TestConsistentHashReadOnly(unittest.TestCase):
+    """Test cases that only read a ring, sharing one built for the class."""
+    
+    NODES = ["node1", "node2", "node3", "node4"]
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared ring once for all tests in the class."""
+        cls.consistent_hash = ConsistentHash(fnv1a_hash)
+        for node in cls.NODES:
+            cls.consistent_hash.add_node(node)
+    
     def test_get_multiple_nodes(self):
         """Test getting multiple nodes for replication."""
-        nodes = ["node1", "node2", "node3", "node4"]
-        for node in nodes:
-            self.consistent_hash.add_node(node)
-        
-        # Test getting multiple nodes
         result_nodes = self.consistent_hash.get_nodes("test_key", 3)
         
         self.assertEqual(len(result_nodes), 3)
@@ -105,14 +185,10 @@ class TestConsistentHash(unittest.TestCase):
         
         # All returned nodes should be valid
         for node in result_nodes:
-            self.assertIn(node, nodes)
-
+            self.assertIn(node, self.NODES)
+    
     def test_consistent_mapping(self):
         """Test that the same key always maps to the same node."""
-        nodes = ["node1", "node2", "node3"]
-        for node in nodes:
-            self.consistent_hash.add_node(node)
-        
         key = "consistent_key"
         first_result = self.consistent_hash.get_node(key)
         
@@ -122,57 +198,31 @@ class TestConsistentHash(unittest.TestCase):
     
     def test_distribution_after_node_addition(self):
         """Test that adding a node doesn't drastically change key distribution."""
-        # Start with two nodes
-        self.consistent_hash.add_node("node1")
-        self.consistent_hash.add_node("node2")
-        
         # Record where keys map initially
-        keys = [f"key_{i}" for i in range(100)]
-        initial_mapping = {key: self.consistent_hash.get_node(key) for key in keys}
+        initial_mapping = {key: self.consistent_hash.get_node(key) for key in KEYS}
         
-        # Add a third node
-        self.consistent_hash.add_node("node3")
+        # Add a fifth node to a copy, leaving the shared ring untouched
+        consistent_hash = copy.deepcopy(self.consistent_hash)
+        consistent_hash.add_node("node5")
         
         # Check how many keys changed
         changed_keys = 0
-        for key in keys:
-            if self.consistent_hash.get_node(key) != initial_mapping[key]:
+        for key in KEYS:
+            if consistent_hash.get_node(key) != initial_mapping[key]:
                 changed_keys += 1
-          # Should be roughly 1/3 of keys (not too many changed)
-        self.assertLess(changed_keys, len(keys) * 0.5)  # Less than 50% changed
+        # Should be roughly 1/5 of keys (not too many changed)
+        self.assertLess(changed_keys, len(KEYS) * 0.5)  # Less than 50% changed
     
     def test_different_hash_functions(self):
         """Test that different hash functions work."""
-        hash1 = ConsistentHash(fnv1a_hash)
         hash2 = ConsistentHash(djb2_hash)
+        for node in self.NODES:
+            hash2.add_node(node)
         
-        # Add same nodes to both
-        for hash_ring in [hash1, hash2]:
-            hash_ring.add_node("node1")
-            hash_ring.add_node("node2")
-          # Both should work (may give different results due to different hash functions)
+        # Both should work (may give different results due to different hash functions)
         key = "test_key"
-        result1 = hash1.get_node(key)
-        result2 = hash2.get_node(key)
-        
-        self.assertIn(result1, ["node1", "node2"])
-        self.assertIn(result2, ["node1", "node2"])
-
-    def test_edge_cases(self):
-        """Test edge cases and error conditions."""
-        # Test with empty key
-        self.consistent_hash.add_node("node1")
-        self.assertEqual(self.consistent_hash.get_node(""), "node1")
-        
-        # Test with unicode key
-        self.assertEqual(self.consistent_hash.get_node("测试"), "node1")
-        
-        # Test get_nodes with zero count
-        self.assertEqual(self.consistent_hash.get_nodes("key", 0), [])
-        
-        # Test get_nodes with count larger than available nodes
-        result = self.consistent_hash.get_nodes("key", 10)
-        self.assertEqual(len(result), 1)  # Only one node available
+        self.assertIn(self.consistent_hash.get_node(key), self.NODES)
+        self.assertIn(hash2.get_node(key), self.NODES)
 
 
 if __name__ == "__main__":
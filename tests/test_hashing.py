@@ -0,0 +1,60 @@
+"""
+Unit tests for the hashing utilities.
+"""
+
+import unittest
+from collections import Counter
+
+from utils.hashing import power_consistent_hash
+
+# Keys shared by the tests, built once
+KEYS = tuple(f"key_{i}" for i in range(2000))
+
+
+class TestPowerConsistentHash(unittest.TestCase):
+    """Test cases for power_consistent_hash."""
+    
+    def test_results_in_range(self):
+        """Test that every key maps to a bucket in [0, n)."""
+        for bucket_count in (2, 3, 5, 8, 9, 100, 1000, 1025):
+            with self.subTest(bucket_count=bucket_count):
+                for key in KEYS[:500]:
+                    bucket = power_consistent_hash(key, bucket_count)
+                    self.assertGreaterEqual(bucket, 0)
+                    self.assertLess(bucket, bucket_count)
+    
+    def test_single_bucket(self):
+        """Test that a single bucket takes every key."""
+        for key in ["", "test_key", "other_key"]:
+            self.assertEqual(power_consistent_hash(key, 1), 0)
+    
+    def test_invalid_bucket_count(self):
+        """Test that a bucket count below one is rejected."""
+        for bucket_count in (0, -1):
+            with self.assertRaises(ValueError):
+                power_consistent_hash("test_key", bucket_count)
+    
+    def test_growing_only_moves_keys_to_new_bucket(self):
+        """Test that going from n to n+1 buckets only moves keys into bucket n."""
+        keys = KEYS[:300]
+        previous = [power_consistent_hash(key, 1) for key in keys]
+        for bucket_count in range(2, 130):
+            current = [power_consistent_hash(key, bucket_count) for key in keys]
+            for key, before, after in zip(keys, previous, current):
+                if before != after:
+                    self.assertEqual(after, bucket_count - 1, f"{key} moved from {before} at n={bucket_count}")
+            previous = current
+    
+    def test_distribution(self):
+        """Test that keys spread roughly evenly over the buckets."""
+        for bucket_count in (10, 12):
+            with self.subTest(bucket_count=bucket_count):
+                distribution = Counter(power_consistent_hash(key, bucket_count) for key in KEYS)
+                expected = len(KEYS) / bucket_count
+                self.assertEqual(len(distribution), bucket_count)
+                self.assertGreater(min(distribution.values()), expected * 0.7)
+                self.assertLess(max(distribution.values()), expected * 1.3)
+
+
+if __name__ == "__main__":
+    unittest.main()
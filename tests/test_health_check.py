@@ -0,0 +1,377 @@
+"""
+Unit tests for the HealthChecker.
+"""
+
+import errno
+import os
+import socket
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from utils.health_check import HealthChecker, HealthCheckResult
+
+
+def _listening_socket(backlog: int = 8) -> socket.socket:
+    """Open a socket listening on a free localhost port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(backlog)
+    return sock
+
+
+def _closed_port() -> int:
+    """Get a localhost port that nothing listens on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class TestTcpCheck(unittest.TestCase):
+    """Test cases for the non-blocking TCP health checks."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.health_checker = HealthChecker(timeout=0.3)
+        self.listener = _listening_socket()
+        self.port = self.listener.getsockname()[1]
+    
+    def tearDown(self):
+        """Close the listening socket."""
+        self.listener.close()
+    
+    def test_listening_port_is_healthy(self):
+        """Test that a port accepting connections reports healthy."""
+        results = self.health_checker._tcp_check_batch([("server1", "127.0.0.1", self.port)])
+        self.assertTrue(results["server1"].is_healthy)
+        self.assertIsNone(results["server1"].error_message)
+    
+    def test_closed_port_is_unhealthy(self):
+        """Test that a refused connect reports the system error message."""
+        results = self.health_checker._tcp_check_batch([("server1", "127.0.0.1", _closed_port())])
+        self.assertFalse(results["server1"].is_healthy)
+        self.assertEqual(results["server1"].error_message, os.strerror(errno.ECONNREFUSED))
+    
+    def test_batch_reports_every_target(self):
+        """Test that one batch checks healthy and unhealthy servers together."""
+        results = self.health_checker._tcp_check_batch([
+            ("up", "127.0.0.1", self.port),
+            ("down", "127.0.0.1", _closed_port()),
+        ])
+        self.assertEqual(set(results), {"up", "down"})
+        self.assertTrue(results["up"].is_healthy)
+        self.assertFalse(results["down"].is_healthy)
+    
+    @unittest.skipUnless(sys.platform.startswith("linux"), "relies on Linux dropping SYNs to a full backlog")
+    def test_unanswered_connect_times_out(self):
+        """Test that a connect that never completes reports a timeout after about timeout seconds."""
+        # A listener whose accept queue is full drops new SYNs, so the connect hangs
+        listener = _listening_socket(backlog=0)
+        port = listener.getsockname()[1]
+        fillers = []
+        try:
+            for _ in range(4):
+                filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                filler.setblocking(False)
+                filler.connect_ex(("127.0.0.1", port))
+                fillers.append(filler)
+            time.sleep(0.05)
+            
+            start = time.monotonic()
+            results = self.health_checker._tcp_check_batch([("server1", "127.0.0.1", port)])
+            elapsed = time.monotonic() - start
+        finally:
+            for filler in fillers:
+                filler.close()
+            listener.close()
+        
+        self.assertFalse(results["server1"].is_healthy)
+        self.assertEqual(results["server1"].error_message, "timed out")
+        self.assertGreaterEqual(elapsed, 0.25)
+        self.assertLess(elapsed, 1.0)
+    
+    def test_socket_creation_failure_is_unhealthy(self):
+        """Test that a socket that cannot be created marks only its own target unhealthy."""
+        real_socket = socket.socket
+        created = []
+        
+        def fake_socket(*args):
+            if created:
+                raise OSError(errno.EMFILE, os.strerror(errno.EMFILE))
+            created.append(real_socket(*args))
+            return created[-1]
+        
+        with patch("socket.socket", side_effect=fake_socket):
+            results = self.health_checker._tcp_check_batch([
+                ("up", "127.0.0.1", self.port),
+                ("no_fd", "127.0.0.1", self.port),
+            ])
+        
+        self.assertTrue(results["up"].is_healthy)
+        self.assertFalse(results["no_fd"].is_healthy)
+        self.assertIn(os.strerror(errno.EMFILE), results["no_fd"].error_message)
+    
+    def test_failed_batch_closes_sockets(self):
+        """Test that sockets waiting on the selector are closed when the batch fails."""
+        real_socket = socket.socket
+        created = []
+        
+        def recording_socket(*args):
+            created.append(real_socket(*args))
+            return created[-1]
+        
+        with patch("socket.socket", side_effect=recording_socket), \
+                patch("selectors.DefaultSelector.select", side_effect=OSError("select failed")):
+            with self.assertRaises(OSError):
+                self.health_checker._tcp_check_batch([
+                    ("server1", "127.0.0.1", self.port),
+                    ("server2", "127.0.0.1", self.port),
+                ])
+        
+        self.assertEqual(len(created), 2)
+        for sock in created:
+            self.assertEqual(sock.fileno(), -1)
+    
+    def test_check_server_tcp_returns_single_result(self):
+        """Test that a single TCP check goes through the batch and returns one result."""
+        self.health_checker.add_server("server1", {"address": "127.0.0.1", "port": self.port}, check_type="tcp")
+        result = self.health_checker._check_server("server1", self.health_checker._servers["server1"])
+        self.assertIsInstance(result, HealthCheckResult)
+        self.assertTrue(result.is_healthy)
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    """Health endpoint that keeps connections open unless asked to close them."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def do_GET(self):
+        self.server.client_ports.append(self.client_address[1])
+        self.server.connections.append(self.connection)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpCheck(unittest.TestCase):
+    """Test cases for HTTP health checks over kept-alive connections."""
+    
+    def setUp(self):
+        """Start a local health endpoint and monitor it."""
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+        self.httpd.client_ports = []
+        self.httpd.connections = []
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        
+        self.health_checker = HealthChecker(timeout=2.0)
+        self.health_checker.add_server("server1", {"address": "127.0.0.1", "port": self.port})
+    
+    def tearDown(self):
+        """Stop the health checker and the endpoint."""
+        self.health_checker.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def _check(self, endpoint: str = "/health"):
+        """Run one HTTP check against the local endpoint."""
+        return self.health_checker._http_check("server1", "127.0.0.1", self.port, endpoint, False, 200)
+    
+    def test_connection_reused_between_checks(self):
+        """Test that consecutive checks share one connection."""
+        self.assertTrue(self._check().is_healthy)
+        self.assertIn("server1", self.health_checker._http_connections)
+        self.assertTrue(self._check().is_healthy)
+        
+        self.assertEqual(len(self.httpd.client_ports), 2)
+        self.assertEqual(self.httpd.client_ports[0], self.httpd.client_ports[1])
+    
+    def test_retry_after_server_closes_idle_connection(self):
+        """Test that a pooled connection closed by the server is replaced once."""
+        self.assertTrue(self._check().is_healthy)
+        
+        # Drop the idle connection from the server side
+        idle = self.httpd.connections[0]
+        idle.shutdown(socket.SHUT_RDWR)
+        time.sleep(0.05)
+        
+        self.assertTrue(self._check().is_healthy)
+        self.assertEqual(len(self.httpd.client_ports), 2)
+        self.assertNotEqual(self.httpd.client_ports[0], self.httpd.client_ports[1])
+    
+    def test_connection_close_is_not_pooled(self):
+        """Test that a response announcing Connection: close is not kept."""
+        self.assertTrue(self._check("/close").is_healthy)
+        self.assertNotIn("server1", self.health_checker._http_connections)
+    
+    def test_remove_server_closes_pooled_connection(self):
+        """Test that removing a server closes its idle connection."""
+        self.assertTrue(self._check().is_healthy)
+        conn = self.health_checker._http_connections["server1"]
+        
+        self.health_checker.remove_server("server1")
+        self.assertNotIn("server1", self.health_checker._http_connections)
+        self.assertIsNone(conn.sock)
+    
+    def test_readding_server_drops_pooled_connection(self):
+        """Test that re-adding a server, whose address may change, drops its connection."""
+        self.assertTrue(self._check().is_healthy)
+        conn = self.health_checker._http_connections["server1"]
+        
+        self.health_checker.add_server("server1", {"address": "127.0.0.1", "port": self.port})
+        self.assertNotIn("server1", self.health_checker._http_connections)
+        self.assertIsNone(conn.sock)
+    
+    def test_stop_closes_pooled_connections(self):
+        """Test that stopping the health checker closes idle connections."""
+        self.assertTrue(self._check().is_healthy)
+        conn = self.health_checker._http_connections["server1"]
+        
+        self.health_checker.stop()
+        self.assertEqual(self.health_checker._http_connections, {})
+        self.assertIsNone(conn.sock)
+
+
+class _ScriptedHealthChecker(HealthChecker):
+    """HealthChecker whose probes return scripted results and record callbacks."""
+    
+    def __init__(self, outcomes, **kwargs):
+        super().__init__(**kwargs)
+        self.outcomes = outcomes  # server_id -> is_healthy
+        self.events = []
+    
+    def _check_server(self, server_id, server_config):
+        if server_id == "gone":
+            # Removed while its probe is running
+            self.remove_server(server_id)
+        return HealthCheckResult(self.outcomes[server_id])
+    
+    def _on_server_healthy(self, server_id):
+        self.events.append(("healthy", server_id))
+    
+    def _on_server_unhealthy(self, server_id):
+        self.events.append(("unhealthy", server_id))
+
+
+class TestCheckRound(unittest.TestCase):
+    """Test cases for one round of health checks."""
+    
+    def setUp(self):
+        """Monitor a healthy, an unhealthy and a soon-removed server."""
+        self.health_checker = _ScriptedHealthChecker(
+            {"up": True, "down": False, "gone": True},
+            healthy_threshold=2,
+            unhealthy_threshold=1,
+        )
+        for index, server_id in enumerate(["up", "down", "gone"]):
+            self.health_checker.add_server(server_id, {"address": "127.0.0.1", "port": 9000 + index})
+        # A TCP target goes through the batch instead of the pool
+        self.health_checker.add_server("tcp", {"address": "127.0.0.1", "port": _closed_port()}, check_type="tcp")
+        
+        self.executor = ThreadPoolExecutor(max_workers=4)
+    
+    def tearDown(self):
+        """Shut down the thread pool."""
+        self.executor.shutdown()
+    
+    def test_round_updates_counters_and_callbacks(self):
+        """Test that results update the counters and fire the threshold callbacks."""
+        health_checker = self.health_checker
+        
+        health_checker._check_all(self.executor)
+        self.assertEqual(health_checker._check_counters["up"], (1, 0))
+        self.assertEqual(health_checker._check_counters["down"], (0, 1))
+        self.assertEqual(health_checker._check_counters["tcp"], (0, 1))
+        self.assertCountEqual(health_checker.events, [("unhealthy", "down"), ("unhealthy", "tcp")])
+        
+        health_checker.events.clear()
+        health_checker._check_all(self.executor)
+        self.assertEqual(health_checker._check_counters["up"], (2, 0))
+        self.assertIn(("healthy", "up"), health_checker.events)
+    
+    def test_server_removed_mid_round_is_skipped(self):
+        """Test that a result for a server removed during the round is dropped."""
+        self.health_checker._check_all(self.executor)
+        
+        self.assertNotIn("gone", self.health_checker._servers)
+        self.assertNotIn("gone", self.health_checker._last_results)
+        self.assertNotIn("gone", self.health_checker._check_counters)
+        self.assertNotIn(("healthy", "gone"), self.health_checker.events)
+        self.assertEqual(set(self.health_checker._last_results), {"up", "down", "tcp"})
+    
+    def test_single_version_bump_per_round(self):
+        """Test that a round bumps the version once, however many results it applies."""
+        self.health_checker.remove_server("gone")
+        version = self.health_checker.version
+        
+        self.health_checker._check_all(self.executor)
+        self.assertEqual(self.health_checker.version, version + 1)
+    
+    def test_targets_rebuilt_only_after_changes(self):
+        """Test that the TCP/probe split is cached until servers change."""
+        tcp_targets, probe_items = self.health_checker._get_targets()
+        self.assertEqual([target[0] for target in tcp_targets], ["tcp"])
+        self.assertEqual(sorted(item[0] for item in probe_items), ["down", "gone", "up"])
+        
+        again = self.health_checker._get_targets()
+        self.assertIs(again[0], tcp_targets)
+        self.assertIs(again[1], probe_items)
+        
+        self.health_checker.remove_server("gone")
+        _, probe_items = self.health_checker._get_targets()
+        self.assertEqual(sorted(item[0] for item in probe_items), ["down", "up"])
+    
+    def test_overrun_round_does_not_cause_burst(self):
+        """Test that rounds after one that overran the interval are still spaced by it."""
+        health_checker = HealthChecker(check_interval=0.05)
+        starts = []
+        
+        def check_all(executor):
+            starts.append(time.monotonic())
+            if len(starts) == 1:
+                time.sleep(0.15)  # Overrun the interval three times over
+        
+        health_checker._check_all = check_all
+        health_checker.start()
+        time.sleep(0.4)
+        health_checker.stop()
+        
+        gaps = [later - earlier for earlier, later in zip(starts[1:], starts[2:])]
+        self.assertGreaterEqual(len(gaps), 2)
+        self.assertGreater(min(gaps), 0.04)
+    
+    def test_failed_round_does_not_stop_monitoring(self):
+        """Test that a round raising unexpectedly is logged and the next rounds still run."""
+        health_checker = HealthChecker(check_interval=0.02)
+        rounds = []
+        
+        def check_all(executor):
+            rounds.append(time.monotonic())
+            if len(rounds) == 1:
+                raise OSError(errno.EMFILE, os.strerror(errno.EMFILE))
+        
+        health_checker._check_all = check_all
+        with self.assertLogs("utils.health_check", level="ERROR") as logs:
+            health_checker.start()
+            time.sleep(0.15)
+            self.assertTrue(health_checker._check_thread.is_alive())
+            health_checker.stop()
+        
+        self.assertGreaterEqual(len(rounds), 3)
+        self.assertIn("Health check round failed", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,19 +1,21 @@
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 import unittest
+from collections import Counter
 from unittest.mock import Mock, patch
 from core.load_balancer import LoadBalancer, Server
 from utils.hashing import get_hash_function
 
+# Shared by every test; the hash function holds no per-test state
+HASH_FUNC = get_hash_function('sha1')
+
+# Lookup keys shared by the tests, built once; tests slice off as many as they need
+KEYS = tuple(f"key_{i}" for i in range(1000))
+
 
 class TestLoadBalancer(unittest.TestCase):
     """Test cases for LoadBalancer."""
     def setUp(self):
         """Set up test fixtures."""
-        hash_func = get_hash_function('sha1')
-        self.load_balancer = LoadBalancer(hash_func)
+        self.load_balancer = LoadBalancer(HASH_FUNC)
         
         # Create test servers
         self.server1 = Server("server1", "localhost", 8001)
@@ -64,11 +66,136 @@ class TestLoadBalancer(unittest.TestCase):
         server2 = self.load_balancer.get_server("test_key")
         self.assertEqual(server.name, server2.name)
         
+    def test_get_server_independent_of_insertion_order(self):
+        """Test that the same servers added in another order route every key alike."""
+        names = [f"server{i}" for i in range(10)]
+        other = LoadBalancer(HASH_FUNC)
+        for name in names:
+            self.load_balancer.add_server(Server(name, "localhost", 8000))
+        for name in reversed(names):
+            other.add_server(Server(name, "localhost", 8000))
+        
+        for key in KEYS:
+            self.assertEqual(self.load_balancer.get_server(key).name, other.get_server(key).name)
+        
+    def test_pool_changes_remap_few_keys(self):
+        """Test that removing a server or changing a weight only moves about its share of keys."""
+        for i in range(10):
+            self.load_balancer.add_server(Server(f"server{i}", "localhost", 8000 + i))
+        before = {key: self.load_balancer.get_server(key).name for key in KEYS}
+        
+        self.load_balancer.remove_server("server3")
+        moved = [key for key in KEYS if self.load_balancer.get_server(key).name != before[key]]
+        self.assertTrue(all(before[key] == "server3" for key in moved))
+        self.assertLess(len(moved) / len(KEYS), 0.15)
+        
+        # Weights are changed by re-adding the server, as PUT /api/servers/<name> does
+        self.load_balancer.add_server(Server("server3", "localhost", 8003))
+        self.load_balancer.remove_server("server5")
+        self.load_balancer.add_server(Server("server5", "localhost", 8005, weight=2))
+        moved = [key for key in KEYS if self.load_balancer.get_server(key).name != before[key]]
+        self.assertLess(len(moved) / len(KEYS), 0.15)
+        
+    def test_unhealthy_server_keys_spread(self):
+        """Test that an unhealthy server's keys spread over the others instead of one neighbour."""
+        for i in range(10):
+            self.load_balancer.add_server(Server(f"server{i}", "localhost", 8000 + i))
+        before = {key: self.load_balancer.get_server(key).name for key in KEYS}
+        
+        self.load_balancer.mark_server_status("server0", False)
+        moved_to = Counter(
+            self.load_balancer.get_server(key).name for key in KEYS if before[key] == "server0"
+        )
+        self.assertNotIn("server0", moved_to)
+        self.assertGreater(len(moved_to), 5)
+        self.assertLess(max(moved_to.values()), sum(moved_to.values()) / 2)
+        
+    def test_get_server_mixed_weights(self):
+        """Test that differing weights use the hash ring."""
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(Server("heavy", "localhost", 8004, weight=3))
+        
+        for key in KEYS[:50]:
+            self.assertEqual(
+                self.load_balancer.get_server(key).name,
+                self.load_balancer.consistent_hash.get_node(key)
+            )
+        
+    def test_get_server_during_updates(self):
+        """Test lock-free lookups while another thread changes the pool."""
+        import threading
+        
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(Server("heavy", "localhost", 8004, weight=2))
+        errors = []
+        done = threading.Event()
+        
+        def lookup():
+            try:
+                while not done.is_set():
+                    for key in KEYS[:50]:
+                        self.assertIsNotNone(self.load_balancer.get_server(key))
+            except Exception as e:
+                errors.append(e)
+        
+        thread = threading.Thread(target=lookup)
+        thread.start()
+        for _ in range(20):
+            self.load_balancer.add_server(self.server2)
+            self.load_balancer.remove_server("server2")
+        done.set()
+        thread.join()
+        
+        self.assertEqual(errors, [])
+        
+    def test_get_server_cached(self):
+        """Test that cached lookups follow pool and health changes."""
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(self.server2)
+        
+        server = self.load_balancer.get_server_cached("test_key")
+        self.assertIs(server, self.load_balancer.get_server("test_key"))
+        self.assertIs(self.load_balancer.get_server_cached("test_key"), server)
+        
+        # A health change bumps the version and bypasses the cached entry
+        self.load_balancer.mark_server_status(server.name, False)
+        other = self.load_balancer.get_server_cached("test_key")
+        self.assertIsNot(other, server)
+        self.assertIs(other, self.load_balancer.get_server("test_key"))
+        
+        self.load_balancer.remove_server(other.name)
+        self.assertIsNone(self.load_balancer.get_server_cached("test_key"))
+        
+    def test_get_servers_batch(self):
+        """Test that batch lookups match get_server key by key."""
+        keys = KEYS[:200]
+        self.assertEqual(self.load_balancer.get_servers_batch(keys), [None] * len(keys))
+        
+        for i in range(4):
+            self.load_balancer.add_server(Server(f"server{i}", "localhost", 8000 + i))
+        self.load_balancer.mark_server_status("server1", False)
+        expected = [self.load_balancer.get_server(key) for key in keys]
+        self.assertEqual(self.load_balancer.get_servers_batch(keys), expected)
+        
+        # Mixed weights go through the ring
+        self.load_balancer.add_server(Server("server4", "localhost", 8004, weight=3))
+        expected = [self.load_balancer.get_server(key) for key in keys]
+        self.assertEqual(self.load_balancer.get_servers_batch(keys), expected)
+        
     def test_get_server_no_servers(self):
         """Test getting server when no servers are available."""
         server = self.load_balancer.get_server("test_key")
         self.assertIsNone(server)
         
+    def test_get_server_single_server(self):
+        """Test that a single server takes every key while it is healthy."""
+        self.load_balancer.add_server(self.server1)
+        for key in ["", "test_key", "other_key"]:
+            self.assertIs(self.load_balancer.get_server(key), self.server1)
+        
+        self.load_balancer.mark_server_status("server1", False)
+        self.assertIsNone(self.load_balancer.get_server("test_key"))
+        
     def test_get_server_no_healthy_servers(self):
         """Test getting server when no healthy servers are available."""
         self.load_balancer.add_server(self.server1)
@@ -95,6 +222,28 @@ class TestLoadBalancer(unittest.TestCase):
         result = self.load_balancer.mark_server_status("nonexistent", True)
         self.assertFalse(result)
         
+    def test_get_counts(self):
+        """Test the maintained healthy and total server counts."""
+        self.assertEqual(self.load_balancer.get_counts(), (0, 0))
+        
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(self.server2)
+        self.assertEqual(self.load_balancer.get_counts(), (2, 2))
+        
+        self.load_balancer.mark_server_status("server1", False)
+        self.load_balancer.mark_server_status("server1", False)
+        self.assertEqual(self.load_balancer.get_counts(), (1, 2))
+        
+        # Replacing an unhealthy server with a healthy one
+        self.load_balancer.add_server(Server("server1", "localhost", 9001))
+        self.assertEqual(self.load_balancer.get_counts(), (2, 2))
+        
+        self.load_balancer.bulk_mutate(add=[self.server3], remove=["server2"])
+        self.assertEqual(self.load_balancer.get_counts(), (2, 2))
+        
+        self.load_balancer.remove_server("server1")
+        self.assertEqual(self.load_balancer.get_counts(), (1, 1))
+        
     def test_get_all_servers(self):
         """Test getting all servers."""
         servers = self.load_balancer.get_all_servers()
@@ -104,10 +253,60 @@ class TestLoadBalancer(unittest.TestCase):
         self.load_balancer.add_server(self.server2)
         
         servers = self.load_balancer.get_all_servers()
-        self.assertEqual(len(servers), 2)
-        server_names = [s.name for s in servers]
-        self.assertIn("server1", server_names)
-        self.assertIn("server2", server_names)
+        self.assertCountEqual([s.name for s in servers], ["server1", "server2"])
+        
+    def test_get_server_by_name(self):
+        """Test looking up servers by name."""
+        self.assertIsNone(self.load_balancer.get_server_by_name("server1"))
+        
+        self.load_balancer.add_server(self.server1)
+        self.assertIs(self.load_balancer.get_server_by_name("server1"), self.server1)
+        
+        self.load_balancer.remove_server("server1")
+        self.assertIsNone(self.load_balancer.get_server_by_name("server1"))
+        
+    def test_bulk_mutate(self):
+        """Test adding and removing several servers at once."""
+        self.load_balancer.add_server(self.server1)
+        
+        result = self.load_balancer.bulk_mutate(
+            add=[self.server2, self.server3, Server("server1", "localhost", 9001)],
+            remove=["nonexistent"]
+        )
+        self.assertEqual(result["added"], ["server2", "server3"])
+        self.assertEqual(result["removed"], [])
+        self.assertEqual(result["skipped"], ["nonexistent", "server1"])
+        self.assertIs(self.load_balancer.servers["server1"], self.server1)
+        
+        result = self.load_balancer.bulk_mutate(remove=["server1", "server2"])
+        self.assertEqual(result["removed"], ["server1", "server2"])
+        self.assertEqual(list(self.load_balancer.servers), ["server3"])
+        self.assertEqual(self.load_balancer.get_server("test_key"), self.server3)
+        
+    def test_bulk_mutate_bad_entry_leaves_pool_untouched(self):
+        """Test that an entry that cannot be looked up raises before the pool changes."""
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(self.server2)
+        version = self.load_balancer.version
+        
+        with self.assertRaises(TypeError):
+            self.load_balancer.bulk_mutate(add=[self.server3], remove=["server1", {"x": 1}])
+        
+        self.assertEqual(list(self.load_balancer.servers), ["server1", "server2"])
+        self.assertEqual(self.load_balancer.get_all_servers(), [self.server1, self.server2])
+        self.assertCountEqual(self.load_balancer.consistent_hash.nodes, ["server1", "server2"])
+        self.assertEqual(self.load_balancer.get_counts(), (2, 2))
+        self.assertEqual(self.load_balancer.version, version)
+        
+    def test_bulk_mutate_replaces_server(self):
+        """Test that removing and re-adding a name in one call replaces the server."""
+        self.load_balancer.add_server(self.server1)
+        replacement = Server("server1", "localhost", 9001)
+        
+        result = self.load_balancer.bulk_mutate(add=[replacement, self.server2], remove=["server1", "server1"])
+        self.assertEqual(result, {"added": ["server1", "server2"], "removed": ["server1"], "skipped": ["server1"]})
+        self.assertIs(self.load_balancer.get_server_by_name("server1"), replacement)
+        self.assertEqual(self.load_balancer.get_counts(), (2, 2))
         
     def test_get_stats(self):
         """Test getting load balancer statistics."""
@@ -125,6 +324,23 @@ class TestLoadBalancer(unittest.TestCase):
         self.assertEqual(stats["total_servers"], 2)
         self.assertEqual(stats["healthy_servers"], 1)
         
+    def test_get_full_stats(self):
+        """Test getting statistics with per-server details."""
+        self.load_balancer.add_server(self.server1)
+        self.load_balancer.add_server(self.server2)
+        self.server1.record_request(0.2)
+        self.server2.record_error()
+        
+        stats = self.load_balancer.get_full_stats()
+        basic_stats = self.load_balancer.get_stats()
+        for key, value in basic_stats.items():
+            self.assertEqual(stats[key], value)
+        
+        self.assertNotIn("servers", basic_stats)
+        self.assertEqual([s["name"] for s in stats["servers"]], ["server1", "server2"])
+        self.assertEqual(stats["servers"][0]["request_count"], 1)
+        self.assertEqual(stats["servers"][1]["error_count"], 1)
+        
     def test_consistent_hashing_distribution(self):
         """Test that consistent hashing distributes keys reasonably."""
         # Add multiple servers
@@ -133,17 +349,12 @@ class TestLoadBalancer(unittest.TestCase):
             self.load_balancer.add_server(server)
         
         # Test distribution of many keys
-        distribution = {}
-        for i in range(1000):
-            key = f"key_{i}"
-            server = self.load_balancer.get_server(key)
-            if server:
-                distribution[server.name] = distribution.get(server.name, 0) + 1
+        servers = self.load_balancer.get_servers_batch(KEYS)
+        distribution = Counter(server.name for server in servers if server)
         
         # Each server should get some requests (rough distribution)
         self.assertEqual(len(distribution), 5)
-        for count in distribution.values():
-            self.assertGreater(count, 100)  # At least 100 requests per server
+        self.assertGreater(min(distribution.values()), 100)  # At least 100 requests per server
             
     def test_add_duplicate_server(self):
         """Test adding a server with duplicate name."""
@@ -158,6 +369,16 @@ class TestLoadBalancer(unittest.TestCase):
         self.assertEqual(len(self.load_balancer.servers), 1)
         server = self.load_balancer.servers["server1"]
         self.assertEqual(server.port, 9001)  # Should be updated
+        
+    def test_add_duplicate_server_without_replace(self):
+        """Test that duplicates are rejected when replacing is disabled."""
+        self.assertTrue(self.load_balancer.add_server(self.server1, replace=False))
+        
+        duplicate_server = Server("server1", "localhost", 9001)
+        self.assertFalse(self.load_balancer.add_server(duplicate_server, replace=False))
+        
+        # Original server should be kept
+        self.assertIs(self.load_balancer.servers["server1"], self.server1)
 
 
 class TestServer(unittest.TestCase):
@@ -181,6 +402,23 @@ class TestServer(unittest.TestCase):
         """Test server URL generation."""
         expected_url = "http://localhost:8080"
         self.assertEqual(self.server.get_url(), expected_url)
+        self.assertEqual(self.server.base_url, expected_url + "/")
+        
+    def test_static_info(self):
+        """Test the cached static server fields."""
+        info = self.server.get_static_info()
+        self.assertEqual(info["name"], "test-server")
+        self.assertEqual(info["weight"], 2)
+        self.assertEqual(info["url"], "http://localhost:8080")
+        
+        # Returned dict is a copy
+        info["weight"] = 5
+        self.assertEqual(self.server.get_static_info()["weight"], 2)
+        
+        # Refresh picks up configuration changes
+        self.server.weight = 3
+        self.server.refresh_static_info()
+        self.assertEqual(self.server.get_static_info()["weight"], 3)
         
     def test_record_request(self):
         """Test recording requests."""
@@ -213,6 +451,9 @@ class TestServer(unittest.TestCase):
         
     def test_response_times_limit(self):
         """Test that response times list is limited."""
+        # The bounded deque drops the oldest time on each append past the window
+        self.assertEqual(self.server.response_times.maxlen, Server.RESPONSE_TIME_WINDOW)
+        
         # Record more than 100 response times
         for i in range(150):
             self.server.record_request(0.1)
@@ -220,6 +461,18 @@ class TestServer(unittest.TestCase):
         # Should only keep the most recent 100
         self.assertEqual(len(self.server.response_times), 100)
         
+    def test_average_response_time_window(self):
+        """Test that the average only covers the retained response times."""
+        for i in range(150):
+            self.server.record_request(float(i))
+        
+        self.assertEqual(list(self.server.response_times), [float(i) for i in range(50, 150)])
+        self.assertAlmostEqual(self.server.get_average_response_time(), sum(range(50, 150)) / 100)
+        
+        self.server.reset_stats()
+        self.assertEqual(self.server.request_count, 0)
+        self.assertEqual(self.server.get_average_response_time(), 0.0)
+        
     def test_server_string_representation(self):
         """Test server string representation."""
         expected_str = "Server(test-server, localhost:8080, healthy)"
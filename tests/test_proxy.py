@@ -0,0 +1,296 @@
+"""
+Unit tests for the proxy middleware.
+"""
+
+import json
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import urllib3
+from urllib3._collections import HTTPHeaderDict
+from werkzeug.test import EnvironBuilder
+
+# The API modules use package-relative imports, so they are imported through src
+from src.api.server import APIServer
+from src.core.load_balancer import LoadBalancer, Server
+from src.utils.hashing import fnv1a_hash
+from src.utils.health_check import HealthChecker
+
+
+def _closed_port() -> int:
+    """Get a localhost port that nothing listens on."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Backend that echoes the request it received as JSON."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def _reply(self):
+        self.server.client_ports.append(self.client_address[1])
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        payload = json.dumps({
+            "method": self.command,
+            "path": self.path,
+            "body": body.decode("latin-1"),
+            "headers": dict(self.headers.items()),
+        }).encode()
+        
+        self.send_response(201 if self.path.startswith("/created") else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Set-Cookie", "a=1; Path=/")
+        self.send_header("Set-Cookie", "b=2; Path=/")
+        self.send_header("X-Backend", "echo")
+        self.send_header("Keep-Alive", "timeout=5")
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    do_GET = do_POST = do_PUT = do_DELETE = _reply
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class _StubResponse:
+    """Backend response whose body and connection handling are scripted."""
+    
+    def __init__(self, chunks, error=None):
+        self.status = 200
+        self.reason = "OK"
+        self.headers = HTTPHeaderDict({"Content-Type": "text/plain"})
+        self.chunks = chunks
+        self.error = error
+        self.calls = []
+    
+    def stream(self, amt=None, decode_content=None):
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+    
+    def close(self):
+        self.calls.append("close")
+    
+    def release_conn(self):
+        self.calls.append("release_conn")
+
+
+class _StubPool:
+    """Connection pool handing out one scripted response."""
+    
+    def __init__(self, response):
+        self.response = response
+    
+    def urlopen(self, method, url, **kwargs):
+        return self.response
+
+
+class ProxyTestCase(unittest.TestCase):
+    """Base class building an API server around a fresh pool for each test."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.load_balancer = LoadBalancer(fnv1a_hash)
+        self.health_checker = HealthChecker()
+        self.api_server = APIServer(self.load_balancer, self.health_checker)
+        self.client = self.api_server.app.test_client()
+    
+    def add_server(self, name: str, port: int) -> Server:
+        """Add a server to the pool directly."""
+        server = Server(name, "127.0.0.1", port)
+        self.load_balancer.add_server(server)
+        return server
+
+
+class TestProxyForwarding(ProxyTestCase):
+    """Test cases for requests proxied to a local backend."""
+    
+    def setUp(self):
+        """Start a local backend and balance over it alone."""
+        super().setUp()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+        self.httpd.client_ports = []
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+        self.server = self.add_server("backend1", self.httpd.server_address[1])
+    
+    def tearDown(self):
+        """Stop the backend."""
+        self.api_server.http.clear()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def test_status_and_headers_pass_through(self):
+        """Test that the status and headers reach the client, minus hop-by-hop ones."""
+        response = self.client.get("/created")
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.headers["X-Backend"], "echo")
+        self.assertEqual(response.headers.getlist("Set-Cookie"), ["a=1; Path=/", "b=2; Path=/"])
+        self.assertNotIn("Keep-Alive", response.headers)
+        self.assertEqual(response.headers["X-Load-Balancer-Server"], "backend1")
+        self.assertIn("X-Load-Balancer-Response-Time", response.headers)
+    
+    def test_query_string_forwarded(self):
+        """Test that the path and query string reach the backend unchanged."""
+        echo = self.client.get("/search/items?q=a%20b&page=2").get_json()
+        self.assertEqual(echo["method"], "GET")
+        self.assertEqual(echo["path"], "/search/items?q=a%20b&page=2")
+    
+    def test_encoded_path_characters_stay_in_path(self):
+        """Test that characters sent percent-encoded reach the backend as part of the path."""
+        for path in ["/a%3Fb%23c/d%20e%25f;v=1?q=1", "/caf%C3%A9/a%3Fb;v=1?q=1"]:
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path).get_json()["path"], path)
+    
+    def test_post_body_forwarded(self):
+        """Test that a request body and its headers reach the backend."""
+        echo = self.client.post(
+            "/upload",
+            data=b"x" * 5000,
+            headers={"Content-Type": "application/octet-stream", "X-Request-Id": "42", "TE": "trailers"},
+        ).get_json()
+        
+        self.assertEqual(echo["method"], "POST")
+        self.assertEqual(echo["body"], "x" * 5000)
+        self.assertEqual(echo["headers"]["Content-Length"], "5000")
+        self.assertEqual(echo["headers"]["Content-Type"], "application/octet-stream")
+        self.assertEqual(echo["headers"]["X-Request-Id"], "42")
+        self.assertNotIn("TE", echo["headers"])
+    
+    def test_stats_recorded_after_body(self):
+        """Test that a request is recorded once its body has been sent, not before."""
+        response = self.client.get("/slow", buffered=False)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.request_count, 0)
+        
+        response.get_data()
+        response.close()
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.server.error_count, 0)
+    
+    def test_connection_released_for_reuse(self):
+        """Test that consecutive requests share one backend connection."""
+        for _ in range(2):
+            self.assertEqual(self.client.get("/ping").status_code, 200)
+        
+        self.assertEqual(len(self.httpd.client_ports), 2)
+        self.assertEqual(self.httpd.client_ports[0], self.httpd.client_ports[1])
+        self.assertEqual(self.server.request_count, 2)
+
+
+class TestProxyErrors(ProxyTestCase):
+    """Test cases for requests that cannot be proxied."""
+    
+    def test_no_servers(self):
+        """Test that an empty pool gets a 503."""
+        response = self.client.get("/anything")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.get_json(), {"error": "No healthy servers available"})
+    
+    def test_no_healthy_servers(self):
+        """Test that a pool with only unhealthy servers gets a 503."""
+        self.add_server("backend1", _closed_port())
+        self.load_balancer.mark_server_status("backend1", False)
+        
+        response = self.client.get("/anything")
+        self.assertEqual(response.status_code, 503)
+    
+    def test_backend_failure(self):
+        """Test that a backend that cannot be reached gets a 502 and an error recorded."""
+        server = self.add_server("backend1", _closed_port())
+        
+        response = self.client.get("/anything")
+        self.assertEqual(response.status_code, 502)
+        payload = response.get_json()
+        self.assertEqual(payload["error"], "Backend server error")
+        self.assertEqual(payload["server"], "backend1")
+        self.assertEqual(server.error_count, 1)
+        self.assertEqual(server.request_count, 0)
+
+
+class TestBackendBody(ProxyTestCase):
+    """Test cases for how the backend body ends, using a scripted backend response."""
+    
+    def setUp(self):
+        """Balance over a single server."""
+        super().setUp()
+        self.server = self.add_server("backend1", 8001)
+    
+    def proxy(self, backend_response: _StubResponse):
+        """Proxy a GET to the scripted response and return the unread body iterable."""
+        # Called directly, as the test client always reads the first chunk
+        middleware = self.api_server.app.wsgi_app
+        middleware.http_pool = _StubPool(backend_response)
+        environ = EnvironBuilder(path="/anything").get_environ()
+        body = middleware(environ, lambda status, headers: None)
+        self.assertEqual(self.server.request_count, 0)
+        return body
+    
+    def test_complete_body_releases_connection(self):
+        """Test that a fully read body hands its connection back without closing it."""
+        backend_response = _StubResponse([b"hello ", b"world"])
+        body = self.proxy(backend_response)
+        
+        self.assertEqual(b"".join(body), b"hello world")
+        self.assertEqual(backend_response.calls, ["release_conn"])
+        body.close()
+        self.assertEqual(backend_response.calls, ["release_conn"])
+        self.assertEqual(self.server.request_count, 1)
+    
+    def test_close_before_body_releases_connection(self):
+        """Test that a body closed before its first chunk still releases the connection."""
+        backend_response = _StubResponse([b"never read"])
+        body = self.proxy(backend_response)
+        
+        body.close()
+        self.assertEqual(backend_response.calls, ["close", "release_conn"])
+        self.assertEqual(self.server.request_count, 1)
+        self.assertEqual(self.server.error_count, 0)
+    
+    def test_backend_failure_mid_body(self):
+        """Test that a body cut off by the backend is recorded as an error."""
+        backend_response = _StubResponse([b"partial"], urllib3.exceptions.ProtocolError("connection broken"))
+        body = self.proxy(backend_response)
+        
+        with self.assertRaises(urllib3.exceptions.ProtocolError):
+            b"".join(body)
+        body.close()
+        self.assertEqual(backend_response.calls, ["close", "release_conn"])
+        self.assertEqual(self.server.error_count, 1)
+        self.assertEqual(self.server.request_count, 0)
+
+
+class TestAppPaths(ProxyTestCase):
+    """Test cases for paths handed to the Flask application."""
+    
+    def test_api_and_management_reach_flask(self):
+        """Test that API and management requests are not proxied."""
+        # No servers, so a proxied request would get the proxy's own 503
+        response = self.client.get("/api/health")
+        self.assertEqual(response.get_json()["status"], "unhealthy")
+        self.assertNotIn("X-Load-Balancer-Server", response.headers)
+        
+        response = self.client.post("/manage/reset")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"message": "Statistics reset successfully"})
+    
+    def test_unknown_app_paths_not_found(self):
+        """Test that unknown API and management paths get the catch-all 404."""
+        for method, path in [("GET", "/api/nope"), ("GET", "/manage/nope"), ("POST", "/api/servers/a/b/c")]:
+            with self.subTest(method=method, path=path):
+                response = self.client.open(path, method=method)
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.get_json(), {"error": "Route not found"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,297 @@
+"""
+Unit tests for the API routes.
+"""
+
+import unittest
+from unittest.mock import patch
+
+# The API modules use package-relative imports, so they are imported through src
+from src.api.server import APIServer
+from src.core.load_balancer import LoadBalancer, Server
+from src.main import setup_load_balancer
+from src.utils.hashing import fnv1a_hash
+from src.utils.health_check import HealthChecker
+
+
+class RoutesTestCase(unittest.TestCase):
+    """Base class building an API server around a fresh pool for each test."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.load_balancer = LoadBalancer(fnv1a_hash)
+        self.health_checker = HealthChecker()
+        self.api_server = APIServer(self.load_balancer, self.health_checker)
+        self.client = self.api_server.app.test_client()
+    
+    def add_server(self, name: str, port: int = 8001) -> Server:
+        """Add a server to the pool directly."""
+        server = Server(name, "localhost", port)
+        self.load_balancer.add_server(server)
+        return server
+
+
+class TestBulkServers(RoutesTestCase):
+    """Test cases for POST /api/servers/bulk."""
+    
+    def test_mixed_add_and_remove(self):
+        """Test that one request adds and removes servers."""
+        self.add_server("old", 8000)
+        self.health_checker.add_server("old", {"address": "localhost", "port": 8000})
+        
+        response = self.client.post("/api/servers/bulk", json={
+            "add": [
+                {"name": "server1", "address": "localhost", "port": 8001},
+                {"name": "server2", "address": "localhost", "port": 8002, "weight": 2},
+            ],
+            "remove": ["old"],
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            "added": ["server1", "server2"],
+            "removed": ["old"],
+            "skipped": [],
+        })
+        self.assertCountEqual(self.load_balancer.servers, ["server1", "server2"])
+        self.assertEqual(self.load_balancer.servers["server2"].weight, 2)
+    
+    def test_added_servers_are_health_checked(self):
+        """Test that added servers are registered with the health checker and removed ones dropped."""
+        self.add_server("old", 8000)
+        self.health_checker.add_server("old", {"address": "localhost", "port": 8000})
+        
+        self.client.post("/api/servers/bulk", json={
+            "add": [{
+                "name": "server1",
+                "address": "localhost",
+                "port": 8001,
+                "health_check_type": "http",
+                "health_check_endpoint": "/ping",
+            }],
+            "remove": ["old"],
+        })
+        
+        self.assertIsNone(self.health_checker.get_summary("old"))
+        config = self.health_checker._servers["server1"]
+        self.assertEqual(config["info"], {"address": "localhost", "port": 8001})
+        self.assertEqual(config["check_type"], "http")
+        self.assertEqual(config["check_endpoint"], "/ping")
+    
+    def test_duplicates_are_skipped(self):
+        """Test that existing names and repeated entries are skipped, not replaced."""
+        existing = self.add_server("server1", 8001)
+        
+        response = self.client.post("/api/servers/bulk", json={
+            "add": [
+                {"name": "server1", "address": "localhost", "port": 9001},
+                {"name": "server2", "address": "localhost", "port": 8002},
+                {"name": "server2", "address": "localhost", "port": 9002},
+            ],
+            "remove": ["missing"],
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {
+            "added": ["server2"],
+            "removed": [],
+            "skipped": ["missing", "server1", "server2"],
+        })
+        self.assertIs(self.load_balancer.servers["server1"], existing)
+        self.assertEqual(self.load_balancer.servers["server2"].port, 8002)
+        self.assertEqual(self.health_checker._servers["server2"]["info"]["port"], 8002)
+    
+    def test_invalid_entry_leaves_pool_untouched(self):
+        """Test that one invalid server rejects the whole request."""
+        self.add_server("old", 8000)
+        
+        response = self.client.post("/api/servers/bulk", json={
+            "add": [
+                {"name": "server1", "address": "localhost", "port": 8001},
+                {"name": "server2", "address": "localhost", "port": 70000},
+            ],
+            "remove": ["old"],
+        })
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("add[1]", response.get_json()["error"])
+        self.assertCountEqual(self.load_balancer.servers, ["old"])
+        self.assertEqual(self.health_checker._servers, {})
+    
+    def test_non_list_fields_rejected(self):
+        """Test that 'add' and 'remove' must be lists."""
+        for payload in ({"add": {"name": "server1"}}, {"remove": "server1"}):
+            with self.subTest(payload=payload):
+                response = self.client.post("/api/servers/bulk", json=payload)
+                self.assertEqual(response.status_code, 400)
+    
+    def test_non_string_remove_entries_rejected(self):
+        """Test that 'remove' entries that are not names reject the request untouched."""
+        self.add_server("s0", 8000)
+        self.add_server("s1", 8001)
+        
+        for remove in (["s0", {"x": 1}], ["s0", 5], [None]):
+            with self.subTest(remove=remove):
+                response = self.client.post("/api/servers/bulk", json={"remove": remove})
+                self.assertEqual(response.status_code, 400)
+                self.assertCountEqual(self.load_balancer.servers, ["s0", "s1"])
+                self.assertCountEqual(self.load_balancer.consistent_hash.nodes, ["s0", "s1"])
+    
+    def test_non_object_body_rejected(self):
+        """Test that a body that is not a JSON object is rejected."""
+        for payload in ([{"name": "server1"}], "server1", None):
+            with self.subTest(payload=payload):
+                response = self.client.post("/api/servers/bulk", json=payload)
+                self.assertEqual(response.status_code, 400)
+
+
+class TestResponseCache(RoutesTestCase):
+    """Test cases for the cached read-only endpoints."""
+    
+    ENDPOINTS = ["/api/servers", "/api/servers?brief=1", "/api/stats", "/api/health"]
+    
+    def setUp(self):
+        """Pin the clock so requests fall in one cache window unless moved on."""
+        super().setUp()
+        self.add_server("server1")
+        self.now = 1000.0
+        clock = patch("src.api.routes.time.monotonic", side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+    
+    def get(self, url: str) -> bytes:
+        """GET a URL and return the response body."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.get_data()
+    
+    def test_cached_within_window(self):
+        """Test that repeated GETs in one window return the cached body."""
+        for url in self.ENDPOINTS:
+            with self.subTest(url=url):
+                self.assertEqual(self.get(url), self.get(url))
+    
+    def test_server_change_invalidates(self):
+        """Test that adding a server serves fresh data at once."""
+        for url in self.ENDPOINTS:
+            with self.subTest(url=url):
+                first = self.get(url)
+                self.add_server(f"extra{len(self.load_balancer.servers)}")
+                self.assertNotEqual(self.get(url), first)
+    
+    def test_health_version_bump_invalidates(self):
+        """Test that a health checker change serves fresh data at once."""
+        first = self.get("/api/servers")
+        self.health_checker.add_server("server1", {"address": "localhost", "port": 8001})
+        second = self.get("/api/servers")
+        self.assertNotEqual(second, first)
+        self.assertIn(b'"health_check"', second)
+    
+    def test_window_expiry_refreshes(self):
+        """Test that counters are refreshed once the TTL window passes."""
+        first = self.get("/api/stats")
+        self.load_balancer.servers["server1"].record_request(0.1)
+        self.assertEqual(self.get("/api/stats"), first)
+        
+        self.now += 0.25
+        self.assertNotEqual(self.get("/api/stats"), first)
+
+
+class TestServerNameRoutes(RoutesTestCase):
+    """Test cases for the server name URL converter."""
+    
+    def test_valid_name_reaches_handler(self):
+        """Test that names up to 64 allowed characters reach the handler."""
+        name = "a" * 64
+        response = self.client.get(f"/api/servers/{name}")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json(), {"error": f"Server {name} not found"})
+        
+        self.add_server("web-1.example:8001_a")
+        response = self.client.get("/api/servers/web-1.example:8001_a")
+        self.assertEqual(response.status_code, 200)
+    
+    def test_invalid_names_do_not_match(self):
+        """Test that names outside the allowed pattern never reach the handlers."""
+        for method, path in [
+            ("GET", "/api/servers/" + "a" * 65),
+            ("GET", "/api/servers/server%201"),
+            ("GET", "/api/servers/server/1"),
+            ("DELETE", "/api/servers/server%201"),
+            ("PUT", "/api/servers/server%201/health"),
+            ("POST", "/manage/drain/" + "a" * 65),
+        ]:
+            with self.subTest(method=method, path=path):
+                response = self.client.open(path, method=method, json={"healthy": True})
+                self.assertEqual(response.status_code, 404)
+                # The handlers' own 404 names the server
+                self.assertNotIn("Server", response.get_json()["error"])
+    
+    def test_config_names_stay_addressable(self):
+        """Test that configured servers the routes could not address are skipped at startup."""
+        config = {"servers": [
+            {"name": "server1", "address": "localhost", "port": 8001},
+            {"name": "server 2", "address": "localhost", "port": 8002},
+            {"name": "s" * 65, "address": "localhost", "port": 8003},
+        ]}
+        with self.assertLogs("src.main", level="ERROR") as logs:
+            load_balancer = setup_load_balancer(config)
+        self.assertEqual(len(logs.output), 2)
+        self.assertEqual(list(load_balancer.servers), ["server1"])
+        
+        client = APIServer(load_balancer, HealthChecker()).app.test_client()
+        for name in load_balancer.servers:
+            self.assertEqual(client.get(f"/api/servers/{name}").status_code, 200)
+
+
+class TestSetServerHealth(RoutesTestCase):
+    """Test cases for PUT /api/servers/<name>/health."""
+    
+    def setUp(self):
+        """Add the server whose health is set."""
+        super().setUp()
+        self.server = self.add_server("server1")
+        self.url = "/api/servers/server1/health"
+    
+    def test_boolean_sets_health(self):
+        """Test that real booleans mark the server."""
+        response = self.client.put(self.url, json={"healthy": False})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.server.healthy)
+        
+        response = self.client.put(self.url, json={"healthy": True})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.server.healthy)
+    
+    def test_non_boolean_rejected(self):
+        """Test that values that are only truthy or falsy are rejected."""
+        for value in ["true", "false", 1, 0, None]:
+            with self.subTest(value=value):
+                response = self.client.put(self.url, json={"healthy": value})
+                self.assertEqual(response.status_code, 400)
+                self.assertTrue(self.server.healthy)
+    
+    def test_missing_key_rejected(self):
+        """Test that a body without the healthy flag is rejected."""
+        response = self.client.put(self.url, json={"status": False})
+        self.assertEqual(response.status_code, 400)
+    
+    def test_malformed_body_rejected(self):
+        """Test that a body that is not valid JSON is rejected."""
+        response = self.client.put(self.url, data='{"healthy": tru', content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(self.server.healthy)
+    
+    def test_non_json_content_type_rejected(self):
+        """Test that a JSON body sent with another content type is rejected."""
+        response = self.client.put(self.url, data='{"healthy": false}', content_type="text/plain")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(self.server.healthy)
+    
+    def test_unknown_server(self):
+        """Test that an unknown server gets a 404."""
+        response = self.client.put("/api/servers/missing/health", json={"healthy": False})
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,23 +11,61 @@ import json
 import time
 import threading
 import argparse
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
+try:
+    import orjson  # Fast C JSON serializer
+except ImportError:
+    # Make orjson optional since it requires installation
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Encode an object as compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
 
 
 class TestServerHandler(BaseHTTPRequestHandler):
     """HTTP handler for test servers."""
     
+    # Keep-alive connections, so the load balancer's pooled connections are reused
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    
+    # Status line and headers of every response, sent with the body in one write.
+    # RESPONSE_HEAD holds everything before Content-Length and is filled in with
+    # the server name once per handler class by create_server_handler.
+    HEADER_TEMPLATE = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Server: %s\r\n"
+    )
+    RESPONSE_HEAD = HEADER_TEMPLATE % b"TestServer"
+    
     def __init__(self, server_name, server_port, *args, **kwargs):
         self.server_name = server_name
         self.server_port = server_port
         self.request_count = 0
         super().__init__(*args, **kwargs)
     
+    def _send_json(self, response_data):
+        """Send a 200 JSON response with a single write."""
+        body = dumps(response_data)
+        self.log_request(200)
+        self.wfile.write(self.RESPONSE_HEAD + b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    
     def do_GET(self):
         """Handle GET requests."""
         self.request_count += 1
         
+        # Health checks get the static response built with the handler class
+        if self.path == "/health":
+            self.log_request(200)
+            self.wfile.write(self.health_response)
+            return
+        
         # Parse URL
         parsed_url = urlparse(self.path)
         query_params = parse_qs(parsed_url.query)
@@ -44,19 +82,13 @@ class TestServerHandler(BaseHTTPRequestHandler):
             "headers": dict(self.headers)
         }
         
-        # Special health check endpoint
+        # Health checks with a query string still get the full response
         if parsed_url.path == "/health":
             response_data["status"] = "healthy"
             response_data["uptime"] = time.time() - getattr(self, 'start_time', time.time())
         
         # Send response
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Server', f'{self.server_name}')
-        self.end_headers()
-        
-        response_json = json.dumps(response_data, indent=2)
-        self.wfile.write(response_json.encode('utf-8'))
+        self._send_json(response_data)
     
     def do_POST(self):
         """Handle POST requests."""
@@ -77,18 +109,16 @@ class TestServerHandler(BaseHTTPRequestHandler):
             "method": "POST",
             "request_count": self.request_count,
             "timestamp": time.time(),
-            "post_data": post_data.decode('utf-8', errors='ignore'),
             "content_length": content_length
         }
         
-        # Send response
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Server', f'{self.server_name}')
-        self.end_headers()
+        # Decoding and escaping the body is the costliest part of a large POST,
+        # so it is only echoed back when asked for with ?echo=1
+        if parse_qs(parsed_url.query).get("echo") == ["1"]:
+            response_data["post_data"] = post_data.decode('utf-8', errors='ignore')
         
-        response_json = json.dumps(response_data, indent=2)
-        self.wfile.write(response_json.encode('utf-8'))
+        # Send response
+        self._send_json(response_data)
     
     def log_message(self, format, *args):
         """Override to provide custom logging."""
@@ -103,6 +133,15 @@ def create_server_handler(server_name, server_port):
             super().__init__(server_name, server_port, *args, **kwargs)
             self.start_time = time.time()
     
+    # Encode the server name into the headers once instead of per response
+    ServerHandler.RESPONSE_HEAD = TestServerHandler.HEADER_TEMPLATE % server_name.encode('utf-8')
+    
+    # Health checks hit /health most often, so its response is built only once
+    health_body = dumps({"server_name": server_name, "server_port": server_port, "status": "healthy"})
+    ServerHandler.health_response = (
+        ServerHandler.RESPONSE_HEAD + b"Content-Length: %d\r\n\r\n" % len(health_body) + health_body
+    )
+    
     return ServerHandler
 
 
@@ -114,7 +153,7 @@ def start_test_server(name, port, delay=0):
     
     try:
         handler_class = create_server_handler(name, port)
-        httpd = HTTPServer(('', port), handler_class)
+        httpd = ThreadingHTTPServer(('', port), handler_class)
         
         print(f"Starting {name} on port {port}")
         print(f"  Health check: http://localhost:{port}/health")
@@ -2,23 +2,27 @@
 Tests for the VirtualNode class.
 """
 
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 import unittest
 from unittest.mock import Mock
-from core.virtual_node import VirtualNode
-from core.load_balancer import Server
+from core.virtual_node import VirtualNode, VirtualNodeManager, virtual_node_hashes
+from core.consistent_hash import ConsistentHash
+from utils.hashing import fnv1a_hash, djb2_hash
 
 
 class TestVirtualNode(unittest.TestCase):
     """Test cases for VirtualNode."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.server = Server("test-server", "localhost", 8080)
-        self.virtual_node = VirtualNode("test-server", 0, 12345)
+    # (first node args, second node args, whether the nodes are equal)
+    EQUALITY_CASES = [
+        (("test-server", 0, 12345), ("test-server", 0, 12345), True),
+        (("test-server", 0, 12345), ("test-server", 1, 12346), False),  # Same server, different ID
+        (("server1", 0, 12345), ("server2", 0, 12345), False),  # Different servers
+    ]
+    
+    @classmethod
+    def setUpClass(cls):
+        """Set up the shared virtual node, which no test mutates."""
+        cls.virtual_node = VirtualNode("test-server", 0, 12345)
     
     def test_virtual_node_creation(self):
         """Test virtual node creation."""
@@ -27,38 +31,19 @@ class TestVirtualNode(unittest.TestCase):
         self.assertEqual(self.virtual_node.hash_value, 12345)
         
     def test_virtual_node_equality(self):
-        """Test virtual node equality."""
-        other_virtual_node = VirtualNode("test-server", 0, 12345)
-        self.assertEqual(self.virtual_node, other_virtual_node)
-        
-        different_virtual_node = VirtualNode("test-server", 1, 12346)
-        self.assertNotEqual(self.virtual_node, different_virtual_node)
-        
-    def test_virtual_node_hash(self):
-        """Test virtual node hashing."""
-        hash1 = hash(self.virtual_node)
-        hash2 = hash(VirtualNode("test-server", 0, 12345))
-        self.assertEqual(hash1, hash2)
+        """Test virtual node equality and hashing."""
+        for a, b, equal in self.EQUALITY_CASES:
+            with self.subTest(a=a, b=b):
+                vnode1, vnode2 = VirtualNode(*a), VirtualNode(*b)
+                self.assertEqual(vnode1 == vnode2, equal)
+                if equal:
+                    self.assertEqual(hash(vnode1), hash(vnode2))
         
     def test_virtual_node_string_representation(self):
         """Test virtual node string representation."""
         expected_str = "VirtualNode(physical=test-server, id=0, hash=12345)"
         self.assertEqual(str(self.virtual_node), expected_str)
         
-    def test_virtual_node_with_different_servers(self):
-        """Test virtual nodes with different servers."""
-        vnode1 = VirtualNode("server1", 0, 12345)
-        vnode2 = VirtualNode("server2", 0, 12345)
-        
-        self.assertNotEqual(vnode1, vnode2)
-        
-    def test_virtual_node_with_same_server_different_id(self):
-        """Test virtual nodes with same server but different virtual IDs."""
-        vnode1 = VirtualNode("test-server", 0, 12345)
-        vnode2 = VirtualNode("test-server", 1, 12346)
-        
-        self.assertNotEqual(vnode1, vnode2)
-        
     def test_virtual_node_weight(self):
         """Test virtual node weight functionality."""
         weighted_node = VirtualNode("test-server", 0, 12345, weight=3)
@@ -68,5 +53,31 @@ class TestVirtualNode(unittest.TestCase):
         self.assertEqual(self.virtual_node.weight, 1)
 
 
+
+class TestVirtualNodeManager(unittest.TestCase):
+    """Test cases for VirtualNodeManager."""
+    
+    def test_matches_ring_positions(self):
+        """Test that the manager and the hash ring place virtual nodes identically."""
+        manager = VirtualNodeManager(fnv1a_hash)
+        v_nodes = manager.create_virtual_nodes("server1", count=100)
+        
+        ring = ConsistentHash(fnv1a_hash)
+        ring.add_node("server1")
+        
+        self.assertEqual([v.hash_value for v in v_nodes], ring.nodes["server1"])
+        self.assertEqual([v.id for v in v_nodes], list(range(100)))
+        
+        manager.remove_virtual_nodes("server1")
+        self.assertEqual(manager.get_virtual_nodes("server1"), [])
+    
+    def test_batch_hashes_match_single_hashes(self):
+        """Test that batch hash functions give the same ring positions."""
+        for hash_func in (fnv1a_hash, djb2_hash):
+            batch_hashes = virtual_node_hashes(hash_func, "server-é1", 150)
+            single_hashes = virtual_node_hashes(lambda key: hash_func(key), "server-é1", 150)
+            self.assertEqual(batch_hashes, single_hashes)
+
+
 if __name__ == '__main__':
     unittest.main()